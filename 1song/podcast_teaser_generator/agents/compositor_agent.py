@@ -2,25 +2,373 @@
 
 import os
 import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import math
+import multiprocessing
+import shutil
+import subprocess
 import uuid
 from typing import Optional
 from loguru import logger
 
 from ..config import settings
 
+try:
+    # MoviePy 2.x
+    from moviepy import VideoFileClip, AudioFileClip, concatenate_videoclips, vfx
+    _MOVIEPY_OK = True
+except ImportError:
+    _MOVIEPY_OK = False
+
+
+_FFMPEG_BIN = shutil.which("ffmpeg")
+_FFPROBE_BIN = shutil.which("ffprobe")
+
+# What _compose_entrypoint can actually run: the ffmpeg path needs durations from ffprobe or
+# MoviePy, the fallback path needs MoviePy. Anything else gets a placeholder composition.
+_FFMPEG_COMPOSE_OK = bool(_FFMPEG_BIN) and (bool(_FFPROBE_BIN) or _MOVIEPY_OK)
+_CAN_COMPOSE = _FFMPEG_COMPOSE_OK or _MOVIEPY_OK
+
+# Quality-targeted rate control for x264 (single pass, no bitrate/VBV constraints)
+_X264_CRF = "23"
+
+# Created on first compose so importing the module never spawns processes
+_COMPOSE_POOL: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def _get_compose_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the shared process pool used for CPU-bound composition."""
+    global _COMPOSE_POOL
+    if _COMPOSE_POOL is None:
+        workers = getattr(settings, 'compose_workers', None) or max(1, (os.cpu_count() or 2) // 2)
+        # spawn, not fork: the parent runs threads (loguru, to_thread workers, progress refresh)
+        # whose locks a forked child could inherit in a held state
+        _COMPOSE_POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _COMPOSE_POOL
+
+
+def _run_ffmpeg(args: list) -> None:
+    """Run ffmpeg with the given arguments, raising with its stderr on failure."""
+    result = subprocess.run(
+        [_FFMPEG_BIN, "-y", "-hide_banner", "-loglevel", "error", *args],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with {result.returncode}: {result.stderr.strip()[-500:]}")
+
+
+def _probe_duration(path: str) -> float:
+    """Read a media file's duration from its container header via ffprobe."""
+    result = subprocess.run(
+        [
+            _FFPROBE_BIN, "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=nokey=1:noprint_wrappers=1",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed for {path}: {result.stderr.strip()}")
+    return float(result.stdout.strip())
+
+
+# Hardware H.264 encoders in order of preference; libx264 is the software fallback
+_HW_ENCODERS = ("h264_nvenc", "h264_videotoolbox", "h264_qsv")
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_video_encoder() -> str:
+    """Pick the first hardware H.264 encoder this ffmpeg build offers, else libx264."""
+    if not _FFMPEG_BIN:
+        return "libx264"
+    result = subprocess.run(
+        [_FFMPEG_BIN, "-hide_banner", "-encoders"],
+        capture_output=True,
+        text=True,
+    )
+    for name in _HW_ENCODERS:
+        if f" {name} " in result.stdout:
+            return name
+    return "libx264"
+
+
+def _encoder_args(encoder: str, preset: str) -> list:
+    """Codec arguments giving roughly CRF-23-equivalent quality for each encoder."""
+    if encoder == "h264_nvenc":
+        return ['-c:v', encoder, '-preset', 'p4', '-rc', 'vbr', '-cq', _X264_CRF]
+    if encoder == "h264_videotoolbox":
+        return ['-c:v', encoder, '-realtime', '1', '-q:v', '60']
+    if encoder == "h264_qsv":
+        return ['-c:v', encoder, '-global_quality', _X264_CRF]
+    return ['-c:v', 'libx264', '-preset', preset, '-crf', _X264_CRF]
+
+
+# Hardware encoders that failed to encode in this process; they are not tried again
+_FAILED_ENCODERS: set = set()
+
+
+def _usable_encoder(encoder: str) -> str:
+    """``encoder``, or libx264 once it has failed in this process."""
+    return "libx264" if encoder in _FAILED_ENCODERS else encoder
+
+
+def _run_ffmpeg_encode(args: list, output_path: str, encoder: str, preset: str) -> None:
+    """Run an ffmpeg video encode, retrying with libx264 if a hardware encoder fails.
+
+    An encoder can be compiled into ffmpeg yet unusable on this machine (no
+    GPU/driver), which only shows up when encoding starts. The failure is
+    remembered so later encodes don't pay for the failed init again.
+    """
+    encoder = _usable_encoder(encoder)
+    try:
+        _run_ffmpeg([*args, *_encoder_args(encoder, preset), '-pix_fmt', 'yuv420p', output_path])
+    except RuntimeError as e:
+        if encoder == "libx264":
+            raise
+        _FAILED_ENCODERS.add(encoder)
+        logger.warning(f"{encoder} encode failed, using libx264 from now on: {e}")
+        _run_ffmpeg([*args, *_encoder_args("libx264", preset), '-pix_fmt', 'yuv420p', output_path])
+
+
+def _reversed_cache_path(video_path: str, cache_dir: str) -> str:
+    """Cache location for the reversed copy of a video, keyed by path, mtime and size."""
+    st = os.stat(video_path)
+    key = hashlib.blake2b(
+        f"{os.path.abspath(video_path)}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    return os.path.join(cache_dir, f"rev_{key}.mp4")
+
+
+def _ensure_reversed(video_path: str, encoder: str, preset: str, cache_dir: str) -> str:
+    """Return the cached reversed copy of a video, rendering it on first use."""
+    rev_path = _reversed_cache_path(video_path, cache_dir)
+    if os.path.exists(rev_path):
+        logger.info(f"Reusing cached reversed video: {rev_path}")
+        return rev_path
+    os.makedirs(os.path.dirname(rev_path), exist_ok=True)
+    tmp_path = rev_path + ".part.mp4"
+    _run_ffmpeg_encode(
+        # Only the picture is reversed; the teaser audio comes from the TTS track
+        ['-i', video_path, '-vf', 'reverse', '-an'],
+        tmp_path,
+        encoder,
+        preset,
+    )
+    os.replace(tmp_path, rev_path)
+    return rev_path
+
+
+def _mux_stream_copy(video_path: str, audio_path: str, output_path: str) -> None:
+    """Attach audio to a video that already covers it, copying the video stream as-is."""
+    _run_ffmpeg([
+        '-i', video_path,
+        '-i', audio_path,
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-c:v', 'copy',
+        '-c:a', 'aac', '-b:a', '128k',
+        '-shortest',
+        '-movflags', '+faststart',
+        output_path,
+    ])
+
+
+def _mux_pingpong(
+    video_path: str,
+    audio_path: str,
+    output_path: str,
+    audio_duration: float,
+    encoder: str,
+    preset: str,
+    cache_dir: str,
+) -> None:
+    """Loop a forward+reverse (ping-pong) copy of the video under the audio.
+
+    The reversed half comes from the on-disk cache and the pair is encoded
+    once; looping and trimming then happen with the video stream copied, so
+    no Python-side clip objects are involved.
+    """
+    rev_path = _ensure_reversed(video_path, encoder, preset, cache_dir)
+    pingpong_path = output_path + ".pingpong.mp4"
+    try:
+        _run_ffmpeg_encode(
+            [
+                '-i', video_path,
+                '-i', rev_path,
+                '-filter_complex', '[0:v][1:v]concat=n=2:v=1:a=0[out]',
+                '-map', '[out]',
+            ],
+            pingpong_path,
+            encoder,
+            preset,
+        )
+        # Loop indefinitely and let -t cut the output at the audio length
+        _run_ffmpeg([
+            '-stream_loop', '-1',
+            '-i', pingpong_path,
+            '-i', audio_path,
+            '-t', f"{audio_duration:.3f}",
+            '-map', '0:v:0', '-map', '1:a:0',
+            '-c:v', 'copy',
+            '-c:a', 'aac', '-b:a', '128k',
+            '-movflags', '+faststart',
+            output_path,
+        ])
+    finally:
+        if os.path.exists(pingpong_path):
+            os.remove(pingpong_path)
+
+
+def _warm_worker() -> None:
+    """No-op run in the compose pool so a worker process is up before the first composition."""
+
+
+def _compose_entrypoint(
+    audio_path: str,
+    video_path: str,
+    output_path: str,
+    encoder: str,
+    preset: str,
+    cache_dir: str,
+) -> str:
+    """Blocking composition; module-level so it can run in a worker process (needs _CAN_COMPOSE).
+
+    Returns the encoder to use next time (libx264 if ``encoder`` turned out to be unusable),
+    so the parent process learns about failures seen in the worker.
+    """
+    if not _CAN_COMPOSE:
+        raise RuntimeError("Neither ffmpeg+ffprobe nor MoviePy is available for composition")
+    if _FFMPEG_COMPOSE_OK:
+        if _FFPROBE_BIN:
+            # Durations are all that is needed to pick a strategy; skip decoder setup
+            video_duration = _probe_duration(video_path)
+            audio_duration = _probe_duration(audio_path)
+        else:
+            with VideoFileClip(video_path) as video, AudioFileClip(audio_path) as audio:
+                video_duration, audio_duration = video.duration, audio.duration
+        # Lazy logging: arguments are only evaluated when INFO is enabled
+        logger.opt(lazy=True).info(
+            "Video: {:.2f}s, audio: {:.2f}s", lambda: video_duration, lambda: audio_duration
+        )
+
+        # If audio is longer than video, build a ping-pong (forward+reverse) loop
+        if audio_duration > video_duration + 0.05:  # tolerance
+            logger.opt(lazy=True).info(
+                "Audio ({:.2f}s) longer than video ({:.2f}s). Building ping-pong loop with ffmpeg.",
+                lambda: audio_duration,
+                lambda: video_duration,
+            )
+            _mux_pingpong(video_path, audio_path, output_path, audio_duration, encoder, preset, cache_dir)
+        else:
+            # Video already covers the audio: remux instead of re-encoding the video stream
+            logger.info("Muxing audio onto original video (stream copy)...")
+            _mux_stream_copy(video_path, audio_path, output_path)
+        logger.success(f"Final video composed successfully: {output_path}")
+        return _usable_encoder(encoder)
+
+    # Load video and audio
+    logger.info("Loading video file...")
+    video = VideoFileClip(video_path)
+    logger.opt(lazy=True).info(
+        "Video loaded: {}s, {}, {}fps", lambda: video.duration, lambda: video.size, lambda: video.fps
+    )
+
+    logger.info("Loading audio file...")
+    audio = AudioFileClip(audio_path)
+    logger.opt(lazy=True).info("Audio loaded: {}s", lambda: audio.duration)
+
+    # If audio is longer than video, build a ping-pong (forward+reverse) loop
+    if audio.duration > video.duration + 0.05:  # tolerance
+        logger.opt(lazy=True).info(
+            "Audio ({:.2f}s) longer than video ({:.2f}s). Building ping-pong loop.",
+            lambda: audio.duration,
+            lambda: video.duration,
+        )
+        # Reverse copy (reuse the cached render when a previous compose produced one)
+        rev_path = _reversed_cache_path(video_path, cache_dir)
+        rev = VideoFileClip(rev_path) if os.path.exists(rev_path) else video.reversed()
+        # Build one forward+reverse cycle and let MoviePy loop it to the audio length
+        logger.opt(lazy=True).info(
+            "Looping ping-pong cycle {}x to cover audio",
+            lambda: math.ceil(audio.duration / (video.duration + rev.duration)),
+        )
+        looped = concatenate_videoclips([video, rev]).with_effects(
+            [vfx.Loop(duration=audio.duration)]
+        )
+        final_video = looped.with_audio(audio)
+    else:
+        # Video is same or longer; trim if needed
+        logger.info("Combining audio with original (or trimming if longer)...")
+        base = video.with_audio(audio)
+        if video.duration > audio.duration + 0.05:
+            base = base.subclipped(0, audio.duration)
+        final_video = base
+
+    # Write final video (MoviePy 2.x parameters with better compatibility)
+    logger.opt(lazy=True).info("Writing final video to: {}", lambda: output_path)
+    extra_audio_opts = {}
+    if audio_path.lower().endswith('.wav'):
+        # Larger chunks mean fewer flushes while transcoding uncompressed audio
+        extra_audio_opts['audio_bufsize'] = 524288
+    final_video.write_videofile(
+        output_path,
+        fps=24,
+        codec='libx264',
+        audio_codec='aac',
+        audio_bitrate='128k',
+        **extra_audio_opts,
+        # 'faster' is ~3-4x quicker than 'medium' with no visible loss at this quality
+        preset=preset,
+        ffmpeg_params=[
+            '-crf', _X264_CRF,
+            '-tune', 'fastdecode',
+            '-movflags', '+faststart',
+            # Sliced threads use all cores without frame-threading lookahead latency
+            '-threads', '0',
+            '-x264-params', 'sliced-threads=1:threads=auto',
+        ],
+        # No per-frame progress bar output
+        logger=None,
+    )
+
+    # Clean up
+    video.close()
+    audio.close()
+    final_video.close()
+
+    logger.success(f"Final video composed successfully: {output_path}")
+    return encoder
+
 
 class CompositorAgent:
     """Agent responsible for compositing final teaser from audio and video."""
     
     def __init__(self):
         """Initialize the compositor agent."""
-        pass
+        self._video_encoder = _usable_encoder(_detect_video_encoder())
+        if self._video_encoder != "libx264":
+            logger.info(f"Using hardware video encoder: {self._video_encoder}")
+    
+    async def prepare(self):
+        """Start a composition worker ahead of time, e.g. while the video is still rendering."""
+        if not _CAN_COMPOSE:
+            return  # placeholder composition runs in-process
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_get_compose_pool(), _warm_worker)
     
     async def compose_teaser(
         self, 
         audio_path: str, 
         video_path: str, 
-        project_id: str
+        project_id: str,
+        output_path: Optional[str] = None
     ) -> str:
         """
         Compose final teaser by combining audio and video.
@@ -29,18 +377,23 @@ class CompositorAgent:
             audio_path: Path to the generated audio file
             video_path: Path to the generated video file  
             project_id: Unique project identifier
+            output_path: Where to write the teaser (default: derived from project_id in the output directory)
             
         Returns:
             Path to the final composed teaser
         """
         logger.info("Compositing final teaser...")
         
-        # Ensure output directory exists
-        os.makedirs(settings.output_dir, exist_ok=True)
-        
-        # Generate final filename
-        final_filename = f"teaser_final_{project_id[:8]}.{settings.output_video_format}"
-        final_path = os.path.join(settings.output_dir, final_filename)
+        if output_path:
+            final_path = output_path
+            os.makedirs(os.path.dirname(final_path) or ".", exist_ok=True)
+        else:
+            # Ensure output directory exists
+            os.makedirs(settings.output_dir, exist_ok=True)
+            
+            # Generate final filename
+            final_filename = f"teaser_final_{project_id[:8]}.{settings.output_video_format}"
+            final_path = os.path.join(settings.output_dir, final_filename)
         
         try:
             # Use MoviePy for audio-video composition
@@ -60,90 +413,35 @@ class CompositorAgent:
         output_path: str
     ):
         """Compose video using MoviePy."""
-        try:
-            # Import for MoviePy 2.x
-            from moviepy import VideoFileClip, AudioFileClip
-            
-            logger.info(f"Composing video: {video_path} + audio: {audio_path}")
-            
-            def compose_sync():
-                # Load video and audio
-                logger.info("Loading video file...")
-                video = VideoFileClip(video_path)
-                logger.info(f"Video loaded: {video.duration}s, {video.size}, {video.fps}fps")
-                
-                logger.info("Loading audio file...")
-                audio = AudioFileClip(audio_path)
-                logger.info(f"Audio loaded: {audio.duration}s")
-                
-                # If audio is longer than video, build a ping-pong (forward+reverse) loop
-                if audio.duration > video.duration + 0.05:  # tolerance
-                    logger.info(
-                        f"Audio ({audio.duration:.2f}s) longer than video ({video.duration:.2f}s). Building ping-pong loop."
-                    )
-                    from moviepy import concatenate_videoclips
-                    # Reverse copy
-                    rev = video.reversed()
-                    # Construct repeated sequence until we exceed audio duration
-                    seq = []
-                    total = 0.0
-                    # One cycle duration (forward+reverse but avoid duplicating boundary frame visually)
-                    cycle = [video, rev]
-                    cycle_duration = video.duration + rev.duration
-                    # Safety guard to avoid runaway loops (max 20 cycles ~ plenty for short teasers)
-                    max_cycles = 20
-                    cycles = 0
-                    while total < audio.duration and cycles < max_cycles:
-                        for clip in cycle:
-                            if total >= audio.duration:
-                                break
-                            seq.append(clip)
-                            total += clip.duration
-                        cycles += 1
-                    looped = concatenate_videoclips(seq)
-                    if looped.duration > audio.duration + 0.05:
-                        logger.info(
-                            f"Trimming looped sequence from {looped.duration:.2f}s to match audio {audio.duration:.2f}s"
-                        )
-                        looped = looped.subclipped(0, audio.duration)
-                    final_video = looped.with_audio(audio)
-                else:
-                    # Video is same or longer; trim if needed
-                    logger.info("Combining audio with original (or trimming if longer)...")
-                    base = video.with_audio(audio)
-                    if video.duration > audio.duration + 0.05:
-                        base = base.subclipped(0, audio.duration)
-                    final_video = base
-                
-                # Write final video (MoviePy 2.x parameters with better compatibility)
-                logger.info(f"Writing final video to: {output_path}")
-                final_video.write_videofile(
-                    output_path,
-                    fps=24,
-                    codec='libx264',
-                    audio_codec='aac',
-                    audio_bitrate='128k',
-                    bitrate='1000k',
-                    preset='medium'
-                )
-                
-                # Clean up
-                video.close()
-                audio.close()
-                final_video.close()
-                
-                logger.success(f"Final video composed successfully: {output_path}")
-            
-            # Run composition in thread pool
-            await asyncio.get_event_loop().run_in_executor(None, compose_sync)
-            
-        except ImportError:
-            logger.warning("MoviePy not available - creating placeholder composition")
+        if not _CAN_COMPOSE:
+            logger.warning("Neither ffmpeg+ffprobe nor MoviePy available - creating placeholder composition")
             # Create placeholder file
             with open(output_path, 'w') as f:
                 f.write(f"# Final teaser composition\n")
                 f.write(f"# Audio: {audio_path}\n")
                 f.write(f"# Video: {video_path}\n")
+            return
+
+        try:
+            logger.info(f"Composing video: {video_path} + audio: {audio_path}")
+            
+            # Run composition in a worker process (libx264/MoviePy work is CPU-bound)
+            loop = asyncio.get_running_loop()
+            usable_encoder = await loop.run_in_executor(
+                _get_compose_pool(),
+                _compose_entrypoint,
+                audio_path,
+                video_path,
+                output_path,
+                self._video_encoder,
+                getattr(settings, 'x264_preset', 'faster'),
+                os.path.join(settings.output_dir, "_cache"),
+            )
+            if usable_encoder != self._video_encoder:
+                # Failed in the worker; skip it for every later compose in this process too
+                _FAILED_ENCODERS.add(self._video_encoder)
+                self._video_encoder = usable_encoder
+            
         except Exception as e:
             logger.error(f"Error in MoviePy composition: {str(e)}")
             raise
@@ -1,68 +1,244 @@
 """Content extraction agent using MCP servers, Azure AI Foundry, or OpenAI GPT models."""
 
+import asyncio
+import functools
+import hashlib
+import os
+import re
 from typing import Optional
+import httpx
 from openai import AsyncOpenAI, AsyncAzureOpenAI
 from loguru import logger
 
+try:
+    import tiktoken
+except ImportError:  # optional; falls back to a character budget
+    tiktoken = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+from ..jsonio import loads
 from ..models import PodcastScript, TeaserContent, InputSpec
 from ..config import settings
 from ..mcp_client import mcp_manager
 
 
+# Outermost {...} span of an LLM reply (greedy, may span lines)
+_JSON_RE = re.compile(rb'\{.*\}', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=4)
+def _shared_openai_client(
+    azure_endpoint: Optional[str],
+    api_key: str,
+    api_version: Optional[str],
+):
+    """Return a process-wide OpenAI client for the given credentials.
+
+    Agents are created per workflow, so sharing the client keeps warm TLS
+    connections in one pool. Closed at shutdown by aclose_shared_clients.
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        http2=_HTTP2_AVAILABLE,
+    )
+    if azure_endpoint:
+        client = AsyncAzureOpenAI(
+            azure_endpoint=azure_endpoint,
+            api_key=api_key,
+            api_version=api_version,
+            http_client=http_client,
+        )
+    else:
+        client = AsyncOpenAI(api_key=api_key, http_client=http_client)
+    _OPENAI_CLIENTS.append(client)
+    return client
+
+
+# Clients handed out by _shared_openai_client, so aclose_shared_clients can reach them
+_OPENAI_CLIENTS: list = []
+
+
+async def aclose_shared_clients() -> None:
+    """Close the shared OpenAI clients (and their connection pools) at shutdown.
+    
+    The cache is cleared as well, so an agent used afterwards (e.g. on a later event loop)
+    gets a fresh client instead of a closed one.
+    """
+    _shared_openai_client.cache_clear()
+    clients = list(_OPENAI_CLIENTS)
+    _OPENAI_CLIENTS.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing OpenAI client: {e}")
+
+
+# Character budget used when tiktoken is not installed (or its encoding can't be loaded)
+_FALLBACK_CHAR_LIMIT = 2000
+_ENCODING = None
+_ENCODING_FAILED = False
+
+
+def _get_encoding():
+    """Return the cached tiktoken encoding (resolved on first use), or None if unavailable.
+
+    The first lookup downloads the BPE file; offline that fails, and the failure is
+    remembered so extraction falls back to a character budget instead of erroring.
+    """
+    global _ENCODING, _ENCODING_FAILED
+    if _ENCODING is None and not _ENCODING_FAILED and tiktoken is not None:
+        try:
+            _ENCODING = tiktoken.encoding_for_model("gpt-4")
+        except Exception as e:
+            _ENCODING_FAILED = True
+            logger.warning(f"tiktoken encoding unavailable, truncating by characters: {e}")
+    return _ENCODING
+
+
+@functools.lru_cache(maxsize=32)
+def _truncate_for_llm(content: str, max_tokens: int = 1500) -> str:
+    """Trim script content to a token budget for LLM/MCP prompts."""
+    enc = _get_encoding()
+    if enc is None:
+        return content[:_FALLBACK_CHAR_LIMIT]
+    tokens = enc.encode(content)
+    if len(tokens) <= max_tokens:
+        return content
+    return enc.decode(tokens[:max_tokens])
+
+
+@functools.lru_cache(maxsize=16)
+def _extraction_prompt_template(hebrew: bool, target: int) -> str:
+    """Extraction prompt with {title}/{content} placeholders for a language and duration.
+
+    Language and duration are passed in per request, so templates are cached
+    per combination rather than per agent.
+    """
+    language_instruction = (
+        "All textual fields (headline, script, key points, visual description) MUST be written entirely in HEBREW (Modern Hebrew, natural, no transliteration)."
+        if hebrew else
+        "All textual fields should be in natural, fluent English."
+    )
+    # Provide a small flexible window around target (e.g., 15 -> 14-16s)
+    lower = max(5, target - 1)
+    upper = target + 1 if target < 120 else target
+    return f"""
+Extract teaser content from this podcast script for a {target}-second social media clip.
+
+{language_instruction}
+
+PODCAST TITLE: {{title}}
+
+SCRIPT CONTENT:
+{{content}}
+
+Please provide:
+1. HEADLINE: A catchy, attention-grabbing headline (max 10 words)
+2. SCRIPT: A {lower}-{upper} second narration script that hooks viewers (stay within this window)
+3. KEY_POINTS: 3-5 bullet points of the most interesting content
+4. VISUAL_DESCRIPTION: Description for video generation (what should be shown)
+
+Format your response as JSON:
+{{{{
+    "headline": "Your catchy headline here",
+    "script": "Your {lower}-{upper} second script here",
+    "key_points": ["Point 1", "Point 2", "Point 3"],
+    "visual_description": "Description of visuals for video generation",
+    "duration_seconds": {target}
+}}}}
+"""
+
+
 class ContentExtractionAgent:
     """Agent responsible for extracting teaser content from podcast scripts."""
     
     def __init__(self):
         """Initialize the content extraction agent."""
-        self.openai_client = None
+        # Arguments for _shared_openai_client; the client itself is looked up on use so one
+        # closed by aclose_shared_clients is transparently replaced
+        self._client_args: Optional[tuple] = None
         
         if settings.use_azure_ai and settings.azure_openai_endpoint and settings.azure_openai_api_key:
             # Use Azure AI Foundry
-            self.openai_client = AsyncAzureOpenAI(
-                azure_endpoint=settings.azure_openai_endpoint,
-                api_key=settings.azure_openai_api_key,
-                api_version=settings.azure_openai_api_version
+            self._client_args = (
+                settings.azure_openai_endpoint,
+                settings.azure_openai_api_key,
+                settings.azure_openai_api_version,
             )
             self.model = settings.azure_deployment_name
             logger.info("Using Azure AI Foundry for content extraction")
         elif settings.openai_api_key:
             # Fallback to direct OpenAI
-            self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+            self._client_args = (None, settings.openai_api_key, None)
             self.model = "gpt-4"
             logger.info("Using OpenAI directly for content extraction")
         else:
             logger.warning("No API keys configured - will use MCP servers or default content only")
     
-    async def extract_teaser_content(self, script: PodcastScript) -> TeaserContent:
+    @property
+    def openai_client(self):
+        """Shared OpenAI client for the configured credentials, or None if none are set."""
+        if self._client_args is None:
+            return None
+        return _shared_openai_client(*self._client_args)
+    
+    async def extract_teaser_content(
+        self,
+        script: PodcastScript,
+        language: Optional[str] = None,
+        duration: Optional[int] = None,
+    ) -> TeaserContent:
         """
         Extract teaser content from a podcast script.
         
         Args:
             script: The original podcast script
+            language: Target language (e.g. he-IL); defaults to settings.azure_speech_language
+            duration: Target clip length in seconds; defaults to settings.max_clip_duration
             
         Returns:
             TeaserContent with extracted information
         """
         logger.info(f"Extracting teaser content for: {script.title}")
         
-        # Try MCP server first
-        if mcp_manager.is_service_available("content"):
-            try:
-                return await self._extract_via_mcp(script)
-            except Exception as e:
-                logger.error(f"MCP content extraction failed: {str(e)}")
-                logger.info("Falling back to OpenAI API")
+        lang = (language or settings.azure_speech_language or "en-US").lower()
+        duration = duration or settings.max_clip_duration
+        cache_path = self._cache_path(script, lang, duration)
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            logger.info(f"Reusing cached teaser content: {cache_path}")
+            return cached
         
-        # Fallback to OpenAI API
+        # Race MCP and OpenAI; the first successful extraction wins
+        tasks = {}
+        if mcp_manager.is_service_available("content"):
+            tasks[asyncio.create_task(self._extract_via_mcp(script, duration))] = "MCP"
         if self.openai_client:
-            try:
-                return await self._extract_via_openai(script)
-            except Exception as e:
-                logger.error(f"OpenAI content extraction failed: {str(e)}")
+            tasks[asyncio.create_task(self._extract_via_openai(script, lang, duration))] = "OpenAI"
+        
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    logger.error(f"{tasks[task]} content extraction failed: {str(task.exception())}")
+                    continue
+                for other in pending:
+                    other.cancel()
+                logger.info(f"Teaser content extracted via {tasks[task]}")
+                teaser = task.result()
+                self._store_cached(cache_path, teaser)
+                return teaser
         
         # Final fallback to default content
         logger.warning("All content extraction methods failed - using default content")
-        return self._create_default_content(script)
+        return self._create_default_content(script, duration)
 
     async def generate_teaser_from_input(self, spec: InputSpec, title: str) -> TeaserContent:
         """Generate teaser content starting from an InputSpec (prompt or full script).
@@ -74,13 +250,10 @@ class ContentExtractionAgent:
         source_text = spec.full_script or spec.prompt or ""
         script = PodcastScript(title=title, content=source_text)
 
-        # Temporarily adjust max_clip_duration to requested target (restore after)
-        original_duration = settings.max_clip_duration
-        settings.max_clip_duration = spec.target_duration_seconds
-        try:
-            teaser = await self.extract_teaser_content(script)
-        finally:
-            settings.max_clip_duration = original_duration
+        # Language and target duration are passed down, never written to the shared settings
+        teaser = await self.extract_teaser_content(
+            script, language=spec.language, duration=spec.target_duration_seconds
+        )
 
         # Override headline if provided
         if spec.headline:
@@ -89,7 +262,7 @@ class ContentExtractionAgent:
         teaser.duration_seconds = spec.target_duration_seconds
         return teaser
     
-    async def _extract_via_mcp(self, script: PodcastScript) -> TeaserContent:
+    async def _extract_via_mcp(self, script: PodcastScript, duration: int) -> TeaserContent:
         """Extract content using MCP server."""
         mcp_client = mcp_manager.get_client("content")
         if not mcp_client:
@@ -98,8 +271,8 @@ class ContentExtractionAgent:
         # Prepare arguments for MCP tool call
         arguments = {
             "title": script.title,
-            "content": script.content[:2000],  # Truncate for token limits
-            "max_duration": settings.max_clip_duration
+            "content": _truncate_for_llm(script.content),  # Truncate for token limits
+            "max_duration": duration
         }
         
         # Call the content extraction tool
@@ -115,15 +288,15 @@ class ContentExtractionAgent:
             script=content_data.get("script", "Check out this amazing insight!"),
             key_points=content_data.get("key_points", ["Interesting content ahead"]),
             visual_description=content_data.get("visual_description", "Dynamic podcast visuals"),
-            duration_seconds=content_data.get("duration_seconds", settings.max_clip_duration)
+            duration_seconds=content_data.get("duration_seconds", duration)
         )
     
-    async def _extract_via_openai(self, script: PodcastScript) -> TeaserContent:
+    async def _extract_via_openai(self, script: PodcastScript, lang: str, duration: int) -> TeaserContent:
         """Extract content using OpenAI API."""
         if not self.openai_client:
             raise Exception("OpenAI client not configured")
         
-        prompt = self._build_extraction_prompt(script)
+        prompt = self._build_extraction_prompt(script, lang, duration)
         
         response = await self.openai_client.chat.completions.create(
             model=self.model,
@@ -144,79 +317,63 @@ class ContentExtractionAgent:
         content = response.choices[0].message.content
         return self._parse_response(content)
     
-    def _create_default_content(self, script: PodcastScript) -> TeaserContent:
+    def _cache_path(self, script: PodcastScript, lang: str, duration: int) -> str:
+        """On-disk cache location for the extraction inputs of a script."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (script.title, script.content, str(duration), lang):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return os.path.join(settings.output_dir, "_llm_cache", f"{digest.hexdigest()}.json")
+    
+    def _load_cached(self, cache_path: str) -> Optional[TeaserContent]:
+        """Load a cached extraction result, ignoring missing or unreadable entries."""
+        try:
+            with open(cache_path, "rb") as f:
+                return TeaserContent(**loads(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable teaser cache entry {cache_path}: {e}")
+            return None
+    
+    def _store_cached(self, cache_path: str, teaser: TeaserContent):
+        """Persist an extraction result; cache failures never fail extraction."""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(teaser.model_dump_json())
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write teaser cache entry {cache_path}: {e}")
+    
+    def _create_default_content(self, script: PodcastScript, duration: int) -> TeaserContent:
         """Create default content when all extraction methods fail."""
         return TeaserContent(
             headline=f"Amazing Insights from {script.title}",
             script="Check out this incredible podcast episode with amazing insights!",
             key_points=["Engaging content", "Expert insights", "Must-listen episode"],
             visual_description="Dynamic podcast studio visuals with text overlay",
-            duration_seconds=settings.max_clip_duration
+            duration_seconds=duration
         )
     
-    def _build_extraction_prompt(self, script: PodcastScript) -> str:
+    def _build_extraction_prompt(self, script: PodcastScript, lang: str, duration: int) -> str:
         """Build the prompt for content extraction."""
-        # Infer target language from settings.azure_speech_language; if Hebrew (he-IL), enforce Hebrew output.
-        lang = (settings.azure_speech_language or "en-US").lower()
-        language_instruction = (
-            "All textual fields (headline, script, key points, visual description) MUST be written entirely in HEBREW (Modern Hebrew, natural, no transliteration)."
-            if lang.startswith("he") else
-            "All textual fields should be in natural, fluent English."
-        )
-        target = settings.max_clip_duration
-        # Provide a small flexible window around target (e.g., 15 -> 14-16s)
-        lower = max(5, target - 1)
-        upper = target + 1 if target < 120 else target
-        return f"""
-Extract teaser content from this podcast script for a {target}-second social media clip.
-
-{language_instruction}
-
-PODCAST TITLE: {script.title}
-
-SCRIPT CONTENT:
-{script.content[:2000]}
-
-Please provide:
-1. HEADLINE: A catchy, attention-grabbing headline (max 10 words)
-2. SCRIPT: A {lower}-{upper} second narration script that hooks viewers (stay within this window)
-3. KEY_POINTS: 3-5 bullet points of the most interesting content
-4. VISUAL_DESCRIPTION: Description for video generation (what should be shown)
-
-Format your response as JSON:
-{{
-    "headline": "Your catchy headline here",
-    "script": "Your {lower}-{upper} second script here",
-    "key_points": ["Point 1", "Point 2", "Point 3"],
-    "visual_description": "Description of visuals for video generation",
-    "duration_seconds": {settings.max_clip_duration}
-}}
-"""
+        # Lower-cased target language; if Hebrew (he-IL), enforce Hebrew output.
+        template = _extraction_prompt_template(lang.startswith("he"), duration)
+        return template.format(title=script.title, content=_truncate_for_llm(script.content))
     
     def _parse_response(self, content: str) -> TeaserContent:
-        """Parse the AI response into TeaserContent model."""
-        import json
+        """Parse the AI response into TeaserContent model.
         
+        Raises ValueError on an unusable reply, so the extraction counts as failed: it is
+        neither cached nor allowed to win the race against the other backend.
+        """
+        # Extract the JSON object from the response
+        match = _JSON_RE.search((content or "").encode("utf-8"))
+        if not match:
+            raise ValueError("No JSON found in AI response")
         try:
-            # Try to extract JSON from the response
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON found in response")
-            
-            json_str = content[start_idx:end_idx]
-            data = json.loads(json_str)
-            
-            return TeaserContent(**data)
-            
+            return TeaserContent(**loads(match.group()))
         except Exception as e:
-            logger.error(f"Error parsing AI response: {str(e)}")
-            # Fallback to manual parsing or default values
-            return TeaserContent(
-                headline="Engaging Podcast Moment",
-                script="Check out this amazing insight from our latest podcast episode!",
-                key_points=["Interesting content ahead"],
-                visual_description="Dynamic podcast-style visuals with text overlay",
-                duration_seconds=settings.max_clip_duration
-            )
+            raise ValueError(f"Error parsing AI response: {e}") from e
@@ -2,16 +2,383 @@
 
 import os
 import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import multiprocessing
+import random
+import shutil
+import ssl
+import string
+import tempfile
+import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Optional
 from openai import AsyncOpenAI, AsyncAzureOpenAI
 from loguru import logger
 
+try:
+    import aiohttp
+except ImportError:  # Sora REST path is skipped without aiohttp
+    aiohttp = None
+
+try:
+    # MoviePy 2.x
+    from moviepy import ColorClip
+except ImportError:
+    ColorClip = None
+try:
+    # Optional; may not be available without ImageMagick
+    from moviepy import TextClip, CompositeVideoClip
+except Exception:
+    TextClip = CompositeVideoClip = None
+_MOVIEPY_HAS_TEXT = bool(TextClip and CompositeVideoClip)
+
 from ..models import TeaserContent
 from ..config import settings
 from ..mcp_client import mcp_manager
 
 
+# Built once at import: create_default_context() loads the CA bundle from disk.
+# Certificate verification is disabled for Azure endpoints.
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+_BASE_HEADERS = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+# Seconds to trust a cached MCP video-service availability check
+_MCP_AVAILABILITY_TTL = 60
+
+# Speculative download probes start this long after submission
+_SORA_PROBE_AFTER_SECONDS = 10
+
+# Download chunk size for Sora videos; 1 MiB keeps per-chunk overhead low for tens-of-MB files
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+_VIDEO_PROMPT_XML = string.Template("""<PodcastTeaserVideo>\n  <Meta>\n    <Duration>${total}s</Duration>\n    <Tone>Curious, cinematic, music-inspired</Tone>\n    <Style>Moody, abstract visuals, no humans</Style>\n  </Meta>\n\n  <Scene id=\"1\" duration=\"${scene1}s\">\n    <Visual>\n      <Description>\n        Wide cinematic shot of a symbolic landscape connected to the song’s (episode’s) mood \n        (e.g., stormy sea for turmoil, neon city lights for nightlife, golden sunrise for hope).\n        Abstract elements appear subtly, like floating text fragments or glowing notes drifting in the air.\n      </Description>\n    </Visual>\n    <Audio>\n      <Narration>${insight}</Narration>\n    </Audio>\n  </Scene>\n\n  <Scene id=\"2\" duration=\"${scene2}s\">\n    <Visual>\n      <Description>\n        Contrast scene that reflects the hidden emotional angle \n        (e.g., a cracked vinyl record glowing from within, dark room lit by shifting colors, \n        or surreal imagery like a bird breaking free from glass).\n      </Description>\n    </Visual>\n    <Audio>\n      <Narration>${emotional}</Narration>\n    </Audio>\n  </Scene>\n\n  <Scene id=\"3\" duration=\"${scene3}s\">\n    <Visual>\n      <Description>\n        Transition to an open-ended symbolic visual that sparks curiosity \n        (e.g., a door slowly opening into bright light, a record spinning into darkness, \n        or floating question marks dissolving into starlight).\n      </Description>\n    </Visual>\n    <Audio>\n      <Narration>${curiosity}</Narration>\n    </Audio>\n  </Scene>\n</PodcastTeaserVideo>""")
+
+
+@functools.lru_cache(maxsize=256)
+def _build_video_prompt_cached(headline: str, key_points: tuple, visual_description: str, duration: int) -> str:
+    """Build the structured XML + guidance prompt; cached per teaser fingerprint."""
+    # Extract narrative fragments
+    insight = (key_points[0] if key_points else headline).strip()
+    emotional = (key_points[1] if len(key_points) > 1 else visual_description.split('.')[0]).strip()
+    curiosity = (key_points[2] if len(key_points) > 2 else f"What comes next in '{headline}'?").strip()
+
+    total = max(5, duration)
+    base_scene = max(2, total // 3)
+    remainder = total - base_scene * 3
+    scene_durations = [base_scene, base_scene, base_scene]
+    for i in range(remainder):
+        scene_durations[i] += 1
+
+    xml_template = _VIDEO_PROMPT_XML.substitute(
+        total=total,
+        scene1=scene_durations[0],
+        scene2=scene_durations[1],
+        scene3=scene_durations[2],
+        insight=insight,
+        emotional=emotional,
+        curiosity=curiosity,
+    )
+
+    guidance = (
+        "You are generating a short vertical social-media teaser video for a podcast episode "
+        f"headline: '{headline}'. The narration lasts about {total} seconds. "
+        "Use the XML specification to drive coherent, cinematic, symbolic visuals. Avoid literal human faces. "
+        "Maintain smooth modern motion, readable composition, and cohesive color mood. If forced to linear text, "
+        "summarize each scene sequentially keeping timing context."
+    )
+
+    parts = [guidance, "\n\n", xml_template, "\n\nKey Points:\n"]
+    parts.extend(f"- {p}\n" for p in key_points)
+    parts.append(f"Visual Description Hints: {visual_description.strip()}\n")
+    return "".join(parts)
+
+
+# Landscape (width, height) of the Sora target resolutions; 9:16 swaps them. Listed explicitly
+# so only sizes the API accepts can ever be requested.
+_SORA_RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+@functools.lru_cache(maxsize=16)
+def _sora_dimensions(resolution: str, aspect_ratio: str) -> tuple:
+    """Map a target resolution ("720p", "1080p") and aspect ratio ("16:9", "9:16") to (width, height)."""
+    size = _SORA_RESOLUTIONS.get(resolution)
+    if size is None:
+        logger.warning(f"Unsupported sora_target_resolution {resolution!r}; using 1080p")
+        size = _SORA_RESOLUTIONS["1080p"]
+    width, height = size
+    if aspect_ratio == "9:16":
+        return height, width
+    if aspect_ratio != "16:9":
+        logger.warning(f"Unknown sora_aspect_ratio {aspect_ratio!r}; using 16:9")
+    return width, height
+
+
+# Entity-level cache of generated videos: fingerprint -> path, least recently used first
+_VIDEO_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_VIDEO_CACHE_SIZE = 128
+
+
+def _entity_key(teaser_content: TeaserContent) -> str:
+    """Fingerprint a teaser by its normalized headline, key points and clip duration."""
+    def norm(text: str) -> str:
+        return " ".join(text.lower().split())
+    
+    parts = [norm(teaser_content.headline), str(teaser_content.duration_seconds)]
+    parts += sorted(norm(p) for p in teaser_content.key_points)
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _remember_video(teaser_content: TeaserContent, video_path: str) -> None:
+    """Record a real (non-placeholder) generated video for entity-level reuse."""
+    key = _entity_key(teaser_content)
+    _VIDEO_CACHE[key] = video_path
+    _VIDEO_CACHE.move_to_end(key)
+    while len(_VIDEO_CACHE) > _VIDEO_CACHE_SIZE:
+        _VIDEO_CACHE.popitem(last=False)
+
+
+def _move_cached_video(old_path: str, new_path: str) -> None:
+    """Re-point cache entries at a video that has been moved (e.g. from a staging path)."""
+    for key, path in _VIDEO_CACHE.items():
+        if path == old_path:
+            _VIDEO_CACHE[key] = new_path
+
+
+def _reuse_cached_video(teaser_content: TeaserContent, video_path: str) -> Optional[str]:
+    """Hardlink (or copy) a cached video for the same entities to video_path; None on miss."""
+    key = _entity_key(teaser_content)
+    cached = _VIDEO_CACHE.get(key)
+    if not cached or not os.path.exists(cached):
+        _VIDEO_CACHE.pop(key, None)
+        return None
+    _VIDEO_CACHE.move_to_end(key)
+    _link_or_copy(cached, video_path)
+    logger.info(f"Reusing previously generated video for matching teaser: {cached}")
+    return video_path
+
+
+_FFMPEG_BIN = shutil.which("ffmpeg")
+
+
+async def _ffmpeg_placeholder(path: str, w: int, h: int, duration: float, color_hex: str, lines: list) -> None:
+    """Render a solid-colour placeholder with centred text lines using ffmpeg's lavfi + drawtext.
+
+    ``lines`` holds ``(text, font_size, color, y_frac)`` tuples; ``y_frac`` of None centres the line
+    vertically. Text is passed via temporary files, referenced by bare name with ffmpeg running
+    in their directory, so neither the text nor the path needs filtergraph escaping.
+    """
+    path = os.path.abspath(path)
+    text_dir = os.path.dirname(path)
+    text_files = []
+    try:
+        filters = []
+        for text, font_size, color, y_frac in lines:
+            fd, text_path = tempfile.mkstemp(suffix=".txt", dir=text_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            text_files.append(text_path)
+            y_expr = "(h-text_h)/2" if y_frac is None else f"h*{y_frac}"
+            filters.append(
+                f"drawtext=textfile={os.path.basename(text_path)}:expansion=none"
+                f":fontsize={font_size}:fontcolor={color}:x=(w-text_w)/2:y={y_expr}"
+            )
+        
+        args = [
+            _FFMPEG_BIN, "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"color=c={color_hex}:s={w}x{h}:d={duration}:r=24",
+        ]
+        if filters:
+            args += ["-vf", ",".join(filters)]
+        args += ["-c:v", "libx264", "-preset", "ultrafast", "-tune", "stillimage", "-pix_fmt", "yuv420p", path]
+        
+        proc = await asyncio.create_subprocess_exec(
+            *args, cwd=text_dir, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg placeholder failed ({proc.returncode}): {stderr.decode(errors='replace').strip()}")
+    finally:
+        for text_path in text_files:
+            try:
+                os.remove(text_path)
+            except OSError:
+                pass
+
+
+# Rendered placeholders keyed by their inputs; the output is fully determined by them
+_PLACEHOLDER_CACHE_DIR = os.path.join(tempfile.gettempdir(), "teaser_placeholders")
+
+_VIDEO_ENCODE_POOL: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def _get_video_encode_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the single-worker process pool used for placeholder encodes."""
+    global _VIDEO_ENCODE_POOL
+    if _VIDEO_ENCODE_POOL is None:
+        # spawn, not fork: the parent runs threads (loguru, to_thread workers, progress refresh)
+        # whose locks a forked child could inherit in a held state
+        _VIDEO_ENCODE_POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _VIDEO_ENCODE_POOL
+
+
+@dataclass(frozen=True)
+class Overlay:
+    """A line of placeholder text: font size is ``min(width // size_divisor, max_size)``."""
+    
+    text: str
+    size_divisor: int
+    max_size: int
+    color: str = "white"
+    y_frac: Optional[float] = None  # None centres the line vertically
+    
+    def font_size(self, width: int) -> int:
+        return min(width // self.size_divisor, self.max_size)
+
+
+# TextClip keyword shapes across MoviePy 1.x/2.x, most specific first
+_TEXT_CLIP_KWARG_SHAPES = (
+    ("text", "font_size", "color"),
+    ("text", "fontsize", "color"),
+    ("text", "color"),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _text_clip_kwarg_shape() -> Optional[tuple]:
+    """Probe once per process which TextClip keyword shape works; None if text is unavailable."""
+    if not _MOVIEPY_HAS_TEXT:
+        return None
+    for shape in _TEXT_CLIP_KWARG_SHAPES:
+        values = {"text": "x", "font_size": 10, "fontsize": 10, "color": "white"}
+        try:
+            TextClip(**{k: values[k] for k in shape}).close()
+            return shape
+        except Exception:
+            continue
+    return None
+
+
+def _make_text_clip(text: str, size: int, color: str = 'white'):
+    """Create a TextClip using the probed keyword shape; None if unavailable."""
+    shape = _text_clip_kwarg_shape()
+    if shape is None:
+        return None
+    values = {"text": text, "font_size": size, "fontsize": size, "color": color}
+    try:
+        return TextClip(**{k: values[k] for k in shape})
+    except Exception:
+        return None
+
+
+def _write_placeholder_moviepy(video_path: str, size: tuple, bg_color: tuple, overlays: tuple, duration: float) -> None:
+    """Render a placeholder with MoviePy (runs in the encode process pool)."""
+    width, height = size
+
+    bg = ColorClip(size=size, color=bg_color, duration=duration)
+    final = bg
+    if _MOVIEPY_HAS_TEXT:
+        clips = [bg]
+        for overlay in overlays:
+            clip = _make_text_clip(overlay.text, overlay.font_size(width), overlay.color)
+            if clip is not None:
+                position = 'center' if overlay.y_frac is None else ('center', height * overlay.y_frac)
+                clips.append(clip.set_position(position).set_duration(duration))
+        if len(clips) > 1:
+            final = CompositeVideoClip(clips)
+    final.write_videofile(
+        video_path,
+        fps=24,
+        codec='libx264',
+        audio=False,
+        preset='medium'
+    )
+    final.close()
+    bg.close()
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink src to dst, copying when linking is not possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _placeholder_cache_path(size: tuple, bg_color: tuple, overlays: list, duration: float) -> str:
+    """Return the cache file for a placeholder render; identical inputs give identical videos."""
+    fingerprint = repr((tuple(size), tuple(bg_color), tuple(overlays), duration))
+    digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+    return os.path.join(_PLACEHOLDER_CACHE_DIR, f"{digest}.mp4")
+
+
+async def _render_placeholder(video_path: str, size: tuple, bg_color: tuple, overlays: list, duration: float) -> None:
+    """Render a solid-colour placeholder video with text overlays.
+
+    Static placeholders are cached by their inputs and hardlinked on repeat renders. Uses ffmpeg
+    directly when available and falls back to MoviePy in the encode process pool. Writes an
+    empty file if neither is available.
+    """
+    cache_path = _placeholder_cache_path(size, bg_color, overlays, duration)
+    if os.path.exists(cache_path):
+        _link_or_copy(cache_path, video_path)
+        logger.info(f"Reusing cached placeholder render: {cache_path}")
+        return
+    
+    rendered = await _render_placeholder_uncached(video_path, size, bg_color, overlays, duration)
+    if rendered:
+        try:
+            os.makedirs(_PLACEHOLDER_CACHE_DIR, exist_ok=True)
+            os.link(video_path, cache_path)
+        except FileExistsError:
+            pass
+        except OSError:
+            try:
+                shutil.copyfile(video_path, cache_path)
+            except OSError as e:
+                logger.debug(f"Could not cache placeholder render: {e}")
+
+
+async def _render_placeholder_uncached(video_path: str, size: tuple, bg_color: tuple, overlays: list, duration: float) -> bool:
+    """Render the placeholder; returns False when only an empty file could be written."""
+    width, height = size
+    if _FFMPEG_BIN:
+        try:
+            color_hex = "0x{:02X}{:02X}{:02X}".format(*bg_color)
+            lines = [(o.text, o.font_size(width), o.color, o.y_frac) for o in overlays]
+            await _ffmpeg_placeholder(video_path, width, height, duration, color_hex, lines)
+            return True
+        except Exception as e:
+            logger.warning(f"ffmpeg placeholder render failed, falling back to MoviePy: {e}")
+    
+    if ColorClip is None:
+        logger.warning("MoviePy not available for placeholder video generation - writing empty placeholder")
+        # An MP4 container would require ffmpeg; as a last resort leave an empty file
+        with open(video_path, 'wb') as f:
+            f.write(b"")
+        return False
+    
+    await asyncio.get_running_loop().run_in_executor(
+        _get_video_encode_pool(),
+        _write_placeholder_moviepy,
+        video_path,
+        tuple(size),
+        tuple(bg_color),
+        tuple(overlays),
+        duration,
+    )
+    return True
+
+
 class VideoGenerationAgent:
     """Agent responsible for generating video clips using MCP servers, Azure AI Foundry, or OpenAI Sora."""
     
@@ -50,30 +417,135 @@ class VideoGenerationAgent:
                 logger.info("Using OpenAI directly for Sora video generation")
         else:
             logger.warning("No API keys configured - will use MCP servers or placeholder video only")
+        
+        # Build download base from sora_endpoint first (same host used for job), fallback to azure endpoint
+        if settings.sora_endpoint and '/openai/' in settings.sora_endpoint:
+            self._download_base = settings.sora_endpoint.split('/openai/')[0].rstrip('/')
+        else:
+            self._download_base = (settings.azure_openai_endpoint or '').rstrip('/')
+        self._download_url_template = (
+            f"{self._download_base}/openai/v1/video/generations/{{gen_id}}/content/video?api-version=preview"
+        )
+        
+        # Shared HTTP session for Sora submit/poll/download (created lazily)
+        self._http_session = None
+        self._http_session_loop = None
+        self._http_session_key = None
+        self._probe_semaphore = None
+        self._submit_sem = None
+        self._download_sem = None
+        
+        # (checked_at, available) for the MCP video service
+        self._mcp_available_cache: Optional[tuple] = None
+    
+    def _mcp_available(self) -> bool:
+        """Return whether the MCP video service is available, re-checking at most once per TTL."""
+        now = time.monotonic()
+        cached = self._mcp_available_cache
+        if cached is not None and now - cached[0] < _MCP_AVAILABILITY_TTL:
+            return cached[1]
+        available = bool(mcp_manager.is_service_available("video"))
+        self._mcp_available_cache = (now, available)
+        return available
+    
+    async def _get_session(self):
+        """Return the pooled aiohttp session, creating it on first use in this event loop."""
+        loop = asyncio.get_running_loop()
+        api_key = settings.sora_api_key or settings.azure_openai_api_key
+        if (
+            self._http_session is not None
+            and not self._http_session.closed
+            and self._http_session_loop is loop
+            and self._http_session_key == api_key
+        ):
+            return self._http_session
+        if self._http_session is not None and not self._http_session.closed and self._http_session_loop is loop:
+            await self._http_session.close()
+        
+        connector = aiohttp.TCPConnector(
+            ssl=_SSL_CTX,
+            limit=10,
+            limit_per_host=5,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+            force_close=False,
+        )
+        self._http_session = aiohttp.ClientSession(
+            connector=connector,
+            # Use lowercase 'api-key' for Azure
+            headers={**_BASE_HEADERS, "api-key": api_key},
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60),
+        )
+        if self._http_session_loop is not loop:
+            # Semaphores are per event loop
+            self._submit_sem = asyncio.Semaphore(getattr(settings, 'max_concurrent_sora_jobs', None) or 4)
+            self._download_sem = asyncio.Semaphore(2)
+            # Bounds concurrent speculative download probes
+            self._probe_semaphore = asyncio.Semaphore(2)
+        self._http_session_loop = loop
+        self._http_session_key = api_key
+        return self._http_session
+    
+    def video_published(self, generated_path: str, final_path: str) -> None:
+        """Record that a video returned by ``generate_video`` was moved to ``final_path``.
+        
+        Callers that generate into a staging path and then rename it must call this, otherwise
+        the entity cache keeps pointing at the staging path and never hits.
+        """
+        _move_cached_video(generated_path, final_path)
+    
+    async def aclose(self):
+        """Close the shared HTTP session, if one was opened."""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+        self._http_session_loop = None
+        self._http_session_key = None
     
-    async def generate_video(self, teaser_content: TeaserContent) -> str:
+    async def generate_video(
+        self,
+        teaser_content: TeaserContent,
+        output_path: Optional[str] = None,
+        force: bool = False,
+    ) -> str:
         """
         Generate video from teaser content.
         
         Args:
             teaser_content: The teaser content with visual description
+            output_path: Where to write the video (default: a new file in the output directory)
+            force: Skip the entity-level video cache and always generate a new video
             
         Returns:
             Path to the generated video file
         """
         logger.info("Generating video...")
         
-        # Ensure output directory exists
-        os.makedirs(settings.output_dir, exist_ok=True)
+        if output_path:
+            video_path = output_path
+            os.makedirs(os.path.dirname(video_path) or ".", exist_ok=True)
+        else:
+            # Ensure output directory exists
+            os.makedirs(settings.output_dir, exist_ok=True)
+            
+            # Generate filename
+            video_filename = f"teaser_video_{uuid.uuid4().hex[:8]}.{settings.output_video_format}"
+            video_path = os.path.join(settings.output_dir, video_filename)
         
-        # Generate filename
-        video_filename = f"teaser_video_{uuid.uuid4().hex[:8]}.{settings.output_video_format}"
-        video_path = os.path.join(settings.output_dir, video_filename)
+        # Reuse a video already generated for the same entities (headline + key points)
+        if not force:
+            cached_path = _reuse_cached_video(teaser_content, video_path)
+            if cached_path:
+                return cached_path
         
         # Try MCP server first
-        if mcp_manager.is_service_available("video"):
+        if self._mcp_available():
             try:
-                return await self._generate_via_mcp(teaser_content, video_path)
+                generated_path = await self._generate_via_mcp(teaser_content, video_path)
+                _remember_video(teaser_content, generated_path)
+                return generated_path
             except Exception as e:
                 logger.error(f"MCP video generation failed: {str(e)}")
                 logger.info("Falling back to Sora API")
@@ -127,38 +599,29 @@ class VideoGenerationAgent:
             logger.info("Generating video with Azure Sora...")
             
             # Azure Sora uses a job-based API
-            import aiohttp
-            import json
-            import time
-            import ssl
-            import random
-            
-            # Create SSL context that doesn't verify certificates (for Azure endpoints)
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
+            if aiohttp is None:
+                raise Exception("aiohttp is not installed")
             
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            
-            headers = {
-                "Content-Type": "application/json",
-                # Use lowercase 'api-key' for Azure
-                "api-key": settings.sora_api_key or settings.azure_openai_api_key
-            }
-            
-            # Create job payload
+            # Create job payload; lower target resolutions cut generation and download time
+            width, height = _sora_dimensions(
+                getattr(settings, 'sora_target_resolution', None) or "1080p",
+                getattr(settings, 'sora_aspect_ratio', None) or "16:9",
+            )
             payload = {
                 "model": settings.sora_model,
                 "prompt": prompt,
-                "height": "1080",
-                "width": "1920",  # 16:9 aspect ratio for social media
+                "height": str(height),
+                "width": str(width),
                 "n_seconds": str(min(teaser_content.duration_seconds, 10)),  # Azure Sora limit
                 "n_variants": "1"
             }
             
-            async with aiohttp.ClientSession(connector=connector) as session:
+            session = await self._get_session()
+            
+            # Bound concurrent Sora jobs (submit + poll + download) to avoid 429s
+            async with self._submit_sem:
                 # Step 1: Submit job
-                async with session.post(settings.sora_endpoint, headers=headers, json=payload) as resp:
+                async with session.post(settings.sora_endpoint, json=payload) as resp:
                     if resp.status not in [200, 201, 202]:
                         error_text = await resp.text()
                         raise Exception(f"Failed to submit Sora job: HTTP {resp.status} - {error_text}")
@@ -174,116 +637,91 @@ class VideoGenerationAgent:
                 status_url = settings.sora_endpoint.replace("/jobs", f"/jobs/{job_id}")
                 max_wait = 300  # 5 minutes max wait
                 start_time = time.time()
+                poll_initial = getattr(settings, 'sora_poll_initial_delay', None) or 0.5
+                poll_delay = poll_initial
+                poll_max = 15.0
+                poll_backoff = 1.5
+                last_status = job_data.get("status")
+                probe_url = None
                 
                 while time.time() - start_time < max_wait:
-                    await asyncio.sleep(5)  # Poll every 5 seconds
+                    # Exponential backoff with jitter: fast jobs return quickly, slow ones aren't hammered
+                    await asyncio.sleep(min(poll_delay, poll_max) + random.uniform(0, 0.25))
+                    poll_delay *= poll_backoff
                     
-                    async with session.get(status_url, headers=headers) as resp:
-                        if resp.status != 200:
+                    # Once the job is running and a generation id is known, speculatively
+                    # request the video alongside the status poll to hide the final RTT
+                    poll_task = asyncio.ensure_future(self._fetch_sora_status(session, status_url))
+                    probe_task = None
+                    if probe_url and time.time() - start_time > _SORA_PROBE_AFTER_SECONDS:
+                        probe_task = asyncio.ensure_future(self._probe_sora_download(session, probe_url))
+                        done, _ = await asyncio.wait({poll_task, probe_task}, return_when=asyncio.FIRST_COMPLETED)
+                        if probe_task not in done:
+                            probe_task.cancel()
+                        elif probe_task.result() is not None:
+                            poll_task.cancel()
+                            video_resp = probe_task.result()
+                            try:
+                                async with self._download_sem:
+                                    saved = await self._save_sora_response(video_resp, output_path)
+                                if saved is not None:
+                                    _remember_video(teaser_content, output_path)
+                                    return output_path
+                            finally:
+                                video_resp.release()
+                        if not poll_task.done():
+                            await asyncio.gather(poll_task, return_exceptions=True)
+                        if poll_task.cancelled():
                             continue
-                        
-                        status_data = await resp.json()
-                        status = status_data.get("status")
-                        
-                        if status in ["completed", "succeeded"]:
-                            generations = status_data.get("generations", [])
-                            if generations:
-                                gen_data = generations[0]
-                                gen_id = gen_data.get("id")
-                                
-                                logger.info(f"🎬 Azure Sora video generation completed!")
-                                logger.info(f"Generation ID: {gen_id}")
-                                logger.info(f"Resolution: {gen_data.get('width')}x{gen_data.get('height')}")
-                                logger.info(f"Duration: {gen_data.get('n_seconds')}s")
-                                
-                                # Step 3: Robust download with backoff retry
-                                # Build download base from sora_endpoint first (same host used for job), fallback to azure endpoint
-                                base_url = None
-                                if settings.sora_endpoint and '/openai/' in settings.sora_endpoint:
-                                    base_url = settings.sora_endpoint.split('/openai/')[0].rstrip('/')
-                                elif settings.azure_openai_endpoint:
-                                    base_url = settings.azure_openai_endpoint.rstrip('/')
-                                else:
-                                    base_url = ""
-                                download_url = f"{base_url}/openai/v1/video/generations/{gen_id}/content/video?api-version=preview"
-                                logger.info(f"Attempting video download from: {download_url}")
-                                
-                                attempts = 0
-                                delay = settings.sora_download_retry_initial_delay
-                                max_attempts = settings.sora_download_retry_max_attempts
-                                max_total_seconds = settings.sora_download_retry_max_seconds
-                                download_start = time.time()
-                                last_error = None
-                                
-                                while attempts < max_attempts and (time.time() - download_start) < max_total_seconds:
-                                    attempts += 1
-                                    try:
-                                        async with session.get(download_url, headers=headers) as video_resp:
-                                            status_code = video_resp.status
-                                            ctype = video_resp.headers.get('content-type', 'unknown')
-                                            clen = video_resp.headers.get('content-length', '0')
-                                            logger.info(f"Download try {attempts}: status={status_code}, type={ctype}, length={clen}")
-                                            
-                                            if status_code == 200 and ('video/' in ctype or int(clen or 0) > 1000):
-                                                expected = int(clen or 0)
-                                                bytes_written = 0
-                                                tmp_path = output_path + ".part"
-                                                
-                                                with open(tmp_path, 'wb') as f:
-                                                    async for chunk in video_resp.content.iter_chunked(1024 * 64):
-                                                        f.write(chunk)
-                                                        bytes_written += len(chunk)
-                                                
-                                                if expected and bytes_written < expected:
-                                                    # Partial content; retry
-                                                    last_error = RuntimeError(
-                                                        f"Partial content: wrote {bytes_written} of {expected} bytes"
-                                                    )
-                                                    logger.warning(str(last_error))
-                                                    try:
-                                                        os.remove(tmp_path)
-                                                    except Exception:
-                                                        pass
-                                                else:
-                                                    os.replace(tmp_path, output_path)
-                                                    logger.success(
-                                                        f"🎬 Real video downloaded via Azure Sora: {output_path} ({bytes_written} bytes)"
-                                                    )
-                                                    return output_path
-                                            else:
-                                                # Not ready yet or wrong content type
-                                                last_error = RuntimeError(
-                                                    f"Not ready: HTTP {status_code}, type={ctype}, len={clen}"
-                                                )
-                                                logger.info(str(last_error))
-                                    except Exception as de:
-                                        last_error = de
-                                        logger.info(f"Download attempt {attempts} errored: {de}")
-                                    
-                                    # Exponential backoff with jitter
-                                    jitter = random.uniform(0, 0.5)
-                                    sleep_for = min(delay * (settings.sora_download_retry_backoff ** (attempts - 1)) + jitter, 30)
-                                    total_elapsed = int(time.time() - download_start)
-                                    logger.info(f"Retrying download in {sleep_for:.1f}s (elapsed {total_elapsed}s)")
-                                    await asyncio.sleep(sleep_for)
-                                
-                                # If we reach here, download failed after retries
-                                logger.error(f"Failed to download Sora video after {attempts} attempts: {last_error}")
-                                await self._create_sora_success_placeholder(output_path, teaser_content, gen_data)
+                    
+                    status_data = await poll_task
+                    if status_data is None:
+                        continue
+                    
+                    status = status_data.get("status")
+                    if status != last_status and status in ["preprocessing", "running"]:
+                        # Job just became active; poll densely again
+                        poll_delay = poll_initial
+                    last_status = status
+                    
+                    if status in ["completed", "succeeded"]:
+                        generations = status_data.get("generations", [])
+                        if generations:
+                            gen_data = generations[0]
+                            gen_id = gen_data.get("id")
+                            
+                            logger.info(f"🎬 Azure Sora video generation completed!")
+                            logger.info(f"Generation ID: {gen_id}")
+                            logger.info(f"Resolution: {gen_data.get('width')}x{gen_data.get('height')}")
+                            logger.info(f"Duration: {gen_data.get('n_seconds')}s")
+                            
+                            # Step 3: Robust download with backoff retry
+                            download_url = self._sora_download_url(gen_id)
+                            logger.info(f"Attempting video download from: {download_url}")
+                            
+                            if await self._download_sora_video(session, download_url, output_path):
+                                _remember_video(teaser_content, output_path)
                                 return output_path
-                            else:
-                                raise Exception(f"No generations found in completed job. Response: {status_data}")
-                        elif status == "failed":
-                            error_msg = status_data.get("error", "Unknown error")
-                            raise Exception(f"Sora job failed: {error_msg}")
-                        elif status in ["pending", "running", "preprocessing", "queued", "processing"]:
-                            logger.info(f"Sora job {status}... waiting ({int(time.time() - start_time)}s elapsed)")
-                            continue
+                            
+                            await self._create_sora_success_placeholder(output_path, teaser_content, gen_data)
+                            return output_path
                         else:
-                            logger.warning(f"Unknown Sora job status: {status}, continuing to wait...")
+                            raise Exception(f"No generations found in completed job. Response: {status_data}")
+                    elif status == "failed":
+                        error_msg = status_data.get("error", "Unknown error")
+                        raise Exception(f"Sora job failed: {error_msg}")
+                    elif status in ["pending", "running", "preprocessing", "queued", "processing"]:
+                        logger.info(f"Sora job {status}... waiting ({int(time.time() - start_time)}s elapsed)")
+                        if status in ["running", "processing"] and not probe_url:
+                            gen_id = (status_data.get("generations") or [{}])[0].get("id")
+                            if gen_id:
+                                probe_url = self._sora_download_url(gen_id)
+                        continue
+                    else:
+                        logger.warning(f"Unknown Sora job status: {status}, continuing to wait...")
                 
                 raise Exception("Sora job timed out")
-                
+            
         except Exception as e:
             logger.error(f"Azure Sora generation error: {e}")
             # Fall back to placeholder if Sora fails
@@ -291,228 +729,225 @@ class VideoGenerationAgent:
             await self._create_placeholder_video(output_path, teaser_content)
             return output_path
     
+    def _sora_download_url(self, gen_id: str) -> str:
+        """Build the content download URL for a Sora generation."""
+        return self._download_url_template.format(gen_id=gen_id)
+    
+    async def _fetch_sora_status(self, session, status_url: str) -> Optional[dict]:
+        """Fetch the job status payload, or None on a non-200 response."""
+        async with session.get(status_url) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json()
+    
+    async def _probe_sora_download(self, session, download_url: str):
+        """Speculatively request the video; return the open response if it is ready, else None."""
+        async with self._probe_semaphore:
+            try:
+                resp = await session.get(download_url)
+            except Exception as e:
+                logger.debug(f"Speculative download probe errored: {e}")
+                return None
+            ctype = resp.headers.get('content-type', '')
+            if resp.status == 200 and 'video/' in ctype:
+                logger.info("Speculative download probe hit; streaming video before final status poll")
+                return resp
+            resp.release()
+            return None
+    
+    async def _save_sora_response(self, video_resp, output_path: str, offset: int = 0) -> Optional[int]:
+        """Stream a download response to output_path; return total bytes, or None if incomplete.
+
+        A 206 response is appended to the existing ``.part`` file at ``offset``; anything else
+        rewrites it from the start. Partial files are kept so the caller can resume with Range.
+        """
+        if video_resp.status != 206:
+            offset = 0
+        expected = int(video_resp.headers.get('content-length', '0') or 0)
+        if expected:
+            expected += offset
+        bytes_written = offset
+        tmp_path = output_path + ".part"
+        
+        # Disk writes run in a worker thread, overlapping with the next network read
+        f = await asyncio.to_thread(open, tmp_path, 'ab' if offset else 'wb')
+        pending_write = None
+        try:
+            async for chunk in video_resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                if pending_write is not None:
+                    await pending_write
+                pending_write = asyncio.ensure_future(asyncio.to_thread(f.write, chunk))
+                bytes_written += len(chunk)
+            if pending_write is not None:
+                await pending_write
+        finally:
+            if pending_write is not None and not pending_write.done():
+                await asyncio.gather(pending_write, return_exceptions=True)
+            await asyncio.to_thread(f.close)
+        
+        if expected and bytes_written < expected:
+            # Partial content; keep the .part file so the caller can resume
+            logger.warning(f"Partial content: wrote {bytes_written} of {expected} bytes")
+            return None
+        
+        os.replace(tmp_path, output_path)
+        logger.success(
+            f"🎬 Real video downloaded via Azure Sora: {output_path} ({bytes_written} bytes)"
+        )
+        return bytes_written
+    
+    async def _download_sora_video(self, session, download_url: str, output_path: str) -> bool:
+        """Download a finished Sora video with exponential backoff; return True on success."""
+        # Few concurrent downloads so egress isn't saturated
+        async with self._download_sem:
+            return await self._download_sora_video_unbounded(session, download_url, output_path)
+    
+    async def _download_sora_video_unbounded(self, session, download_url: str, output_path: str) -> bool:
+        """Retry loop behind _download_sora_video."""
+        attempts = 0
+        delay = settings.sora_download_retry_initial_delay
+        max_attempts = settings.sora_download_retry_max_attempts
+        max_total_seconds = settings.sora_download_retry_max_seconds
+        download_start = time.time()
+        last_error = None
+        head_supported = True
+        tmp_path = output_path + ".part"
+        
+        while attempts < max_attempts and (time.time() - download_start) < max_total_seconds:
+            attempts += 1
+            try:
+                # Resume from whatever a previous attempt of this download left behind
+                resume_from = os.path.getsize(tmp_path) if attempts > 1 and os.path.exists(tmp_path) else 0
+                ready = True
+                if head_supported:
+                    # Cheap headers-only preflight; only fetch the body once the video is ready
+                    async with session.head(download_url, allow_redirects=True) as head_resp:
+                        status_code = head_resp.status
+                        ctype = head_resp.headers.get('content-type', 'unknown')
+                        clen = head_resp.headers.get('content-length', '0')
+                    if status_code in (405, 501):
+                        logger.info("Download endpoint does not support HEAD; using GET for readiness checks")
+                        head_supported = False
+                    elif not (status_code == 200 and ('video/' in ctype or int(clen or 0) > 1000)):
+                        last_error = RuntimeError(
+                            f"Not ready: HTTP {status_code}, type={ctype}, len={clen}"
+                        )
+                        logger.info(f"Download preflight {attempts}: {last_error}")
+                        ready = False
+                
+                if ready:
+                    range_headers = {"Range": f"bytes={resume_from}-"} if resume_from else None
+                    async with session.get(download_url, headers=range_headers) as video_resp:
+                        status_code = video_resp.status
+                        ctype = video_resp.headers.get('content-type', 'unknown')
+                        clen = video_resp.headers.get('content-length', '0')
+                        logger.info(f"Download try {attempts}: status={status_code}, type={ctype}, length={clen}")
+                        if video_resp.connection is not None and video_resp.connection.transport is not None:
+                            sock = video_resp.connection.transport.get_extra_info('socket')
+                            logger.debug(f"Download try {attempts} using socket {sock.getsockname() if sock else None}")
+                        
+                        if status_code == 416:
+                            # Stale partial file; truncate in place (no unlink/create churn) and start over
+                            last_error = RuntimeError("Range not satisfiable; restarting download")
+                            logger.info(str(last_error))
+                            os.truncate(tmp_path, 0)
+                        elif status_code == 206 or (status_code == 200 and ('video/' in ctype or int(clen or 0) > 1000)):
+                            if await self._save_sora_response(video_resp, output_path, resume_from) is not None:
+                                return True
+                            last_error = RuntimeError("Partial content")
+                        else:
+                            # Not ready yet or wrong content type
+                            last_error = RuntimeError(
+                                f"Not ready: HTTP {status_code}, type={ctype}, len={clen}"
+                            )
+                            logger.info(str(last_error))
+            except Exception as de:
+                last_error = de
+                logger.info(f"Download attempt {attempts} errored: {de}")
+            
+            # Exponential backoff with jitter
+            jitter = random.uniform(0, 0.5)
+            sleep_for = min(delay * (settings.sora_download_retry_backoff ** (attempts - 1)) + jitter, 30)
+            total_elapsed = int(time.time() - download_start)
+            logger.info(f"Retrying download in {sleep_for:.1f}s (elapsed {total_elapsed}s)")
+            await asyncio.sleep(sleep_for)
+        
+        # If we reach here, download failed after retries
+        logger.error(f"Failed to download Sora video after {attempts} attempts: {last_error}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    
     def _build_video_prompt(self, teaser_content: TeaserContent) -> str:
         """Build a structured XML + guidance prompt for video generation."""
-        # Extract narrative fragments
-        insight = (teaser_content.key_points[0] if teaser_content.key_points else teaser_content.headline).strip()
-        emotional = (teaser_content.key_points[1] if len(teaser_content.key_points) > 1 else teaser_content.visual_description.split('.')[0]).strip()
-        curiosity = (teaser_content.key_points[2] if len(teaser_content.key_points) > 2 else f"What comes next in '{teaser_content.headline}'?").strip()
-
-        total = max(5, teaser_content.duration_seconds)
-        base_scene = max(2, total // 3)
-        remainder = total - base_scene * 3
-        scene_durations = [base_scene, base_scene, base_scene]
-        for i in range(remainder):
-            scene_durations[i] += 1
-
-        def fmt_secs(s: int) -> str:  # local helper
-            return f"{s}s"
-
-        xml_template = f"""<PodcastTeaserVideo>\n  <Meta>\n    <Duration>{total}s</Duration>\n    <Tone>Curious, cinematic, music-inspired</Tone>\n    <Style>Moody, abstract visuals, no humans</Style>\n  </Meta>\n\n  <Scene id=\"1\" duration=\"{fmt_secs(scene_durations[0])}\">\n    <Visual>\n      <Description>\n        Wide cinematic shot of a symbolic landscape connected to the song’s (episode’s) mood \n        (e.g., stormy sea for turmoil, neon city lights for nightlife, golden sunrise for hope).\n        Abstract elements appear subtly, like floating text fragments or glowing notes drifting in the air.\n      </Description>\n    </Visual>\n    <Audio>\n      <Narration>{insight}</Narration>\n    </Audio>\n  </Scene>\n\n  <Scene id=\"2\" duration=\"{fmt_secs(scene_durations[1])}\">\n    <Visual>\n      <Description>\n        Contrast scene that reflects the hidden emotional angle \n        (e.g., a cracked vinyl record glowing from within, dark room lit by shifting colors, \n        or surreal imagery like a bird breaking free from glass).\n      </Description>\n    </Visual>\n    <Audio>\n      <Narration>{emotional}</Narration>\n    </Audio>\n  </Scene>\n\n  <Scene id=\"3\" duration=\"{fmt_secs(scene_durations[2])}\">\n    <Visual>\n      <Description>\n        Transition to an open-ended symbolic visual that sparks curiosity \n        (e.g., a door slowly opening into bright light, a record spinning into darkness, \n        or floating question marks dissolving into starlight).\n      </Description>\n    </Visual>\n    <Audio>\n      <Narration>{curiosity}</Narration>\n    </Audio>\n  </Scene>\n</PodcastTeaserVideo>"""
-
-        guidance = (
-            "You are generating a short vertical social-media teaser video for a podcast episode "
-            f"headline: '{teaser_content.headline}'. The narration lasts about {total} seconds. "
-            "Use the XML specification to drive coherent, cinematic, symbolic visuals. Avoid literal human faces. "
-            "Maintain smooth modern motion, readable composition, and cohesive color mood. If forced to linear text, "
-            "summarize each scene sequentially keeping timing context."
+        return _build_video_prompt_cached(
+            teaser_content.headline,
+            tuple(teaser_content.key_points),
+            teaser_content.visual_description,
+            teaser_content.duration_seconds,
         )
-
-        summary_points = "\n".join(f"- {p}" for p in teaser_content.key_points)
-        nl_summary = f"Key Points:\n{summary_points}\nVisual Description Hints: {teaser_content.visual_description.strip()}"
-
-        return guidance + "\n\n" + xml_template + "\n\n" + nl_summary + "\n"
     
     async def _create_placeholder_video(self, video_path: str, teaser_content: TeaserContent):
         """Create a placeholder video until Sora API is available."""
         try:
-            # MoviePy 2.x imports
-            from moviepy import ColorClip
-            try:
-                from moviepy import TextClip  # optional; may not be available without ImageMagick
-                from moviepy import CompositeVideoClip
-                has_text = True
-            except Exception:
-                CompositeVideoClip = None
-                TextClip = None
-                has_text = False
-
-            # Compatibility helper for TextClip (MoviePy 1.x vs 2.x)
-            def make_text(text: str, size: int, color: str):  # returns a clip or None
-                if not TextClip:
-                    return None
-                for kwargs in (
-                    {"text": text, "font_size": size, "color": color},
-                    {"text": text, "fontsize": size, "color": color},
-                    {"text": text, "color": color},
-                ):
-                    try:
-                        return TextClip(**kwargs)
-                    except Exception:
-                        continue
-                return None
-
-            def build_and_write():
-                bg = ColorClip(size=(720, 1280), color=(30, 30, 40), duration=teaser_content.duration_seconds)
-                if has_text and CompositeVideoClip and TextClip:
-                    title_clip = make_text(teaser_content.headline, 60, 'white')
-                    if title_clip is not None:
-                        title_clip = title_clip.set_position('center').set_duration(teaser_content.duration_seconds)
-                        final = CompositeVideoClip([bg, title_clip])
-                    else:
-                        final = bg
-                else:
-                    final = bg
-                final.write_videofile(
-                    video_path,
-                    fps=24,
-                    codec='libx264',
-                    audio=False,
-                    preset='medium'
-                )
-                final.close()
-                bg.close()
-
-            await asyncio.get_event_loop().run_in_executor(None, build_and_write)
+            await _render_placeholder(
+                video_path,
+                (720, 1280),
+                (30, 30, 40),
+                [Overlay(teaser_content.headline, 12, 60)],
+                teaser_content.duration_seconds,
+            )
             logger.info(f"Placeholder video created: {video_path}")
-        except ImportError:
-            logger.warning("MoviePy not available for placeholder video generation - skipping video creation")
-            # Create an empty binary MP4 container would require ffmpeg; as a last resort leave no video
-            with open(video_path, 'wb') as f:
-                f.write(b"")
         except Exception as e:
             logger.error(f"Error creating placeholder video: {str(e)}")
             raise
 
     async def _create_sora_placeholder_video(self, video_path: str, teaser_content: TeaserContent, generation_metadata: dict):
         """Create a placeholder video with Sora generation metadata."""
+        width = generation_metadata.get('width', 1920)
+        height = generation_metadata.get('height', 1080)
+        duration = generation_metadata.get('n_seconds', teaser_content.duration_seconds)
+        gen_id = generation_metadata.get('id', 'unknown')
+        
         try:
-            from moviepy import ColorClip
-            try:
-                from moviepy import TextClip
-                from moviepy import CompositeVideoClip
-                has_text = True
-            except Exception:
-                CompositeVideoClip = None
-                TextClip = None
-                has_text = False
-
-            width = generation_metadata.get('width', 1920)
-            height = generation_metadata.get('height', 1080)
-            duration = generation_metadata.get('n_seconds', teaser_content.duration_seconds)
-
-            def build_and_write():
-                bg = ColorClip(size=(width, height), color=(20, 50, 80), duration=duration)
-                if has_text and CompositeVideoClip and TextClip:
-                    # local helper
-                    def t(txt, sz, color='white'):  # noqa: E306
-                        for kwargs in (
-                            {"text": txt, "font_size": sz, "color": color},
-                            {"text": txt, "fontsize": sz, "color": color},
-                            {"text": txt, "color": color},
-                        ):
-                            try:
-                                return TextClip(**kwargs)
-                            except Exception:
-                                continue
-                        return None
-                    title_text = f"SORA GENERATED\n{teaser_content.headline}"
-                    title = t(title_text, min(width//20, 60))
-                    meta_text = f"Resolution: {width}x{height} | Duration: {duration}s | Generation ID: {generation_metadata.get('id', 'unknown')}"
-                    meta = t(meta_text, min(width//40, 30), 'lightgray')
-                    clips = [bg]
-                    if title is not None:
-                        title = title.set_position('center').set_duration(duration)
-                        clips.append(title)
-                    if meta is not None:
-                        meta = meta.set_position(('center', height*0.7)).set_duration(duration)
-                        clips.append(meta)
-                    final = CompositeVideoClip(clips) if len(clips) > 1 else bg
-                else:
-                    final = bg
-                final.write_videofile(
-                    video_path,
-                    fps=24,
-                    codec='libx264',
-                    audio=False,
-                    preset='medium'
-                )
-                final.close()
-                bg.close()
-
-            await asyncio.get_event_loop().run_in_executor(None, build_and_write)
+            await _render_placeholder(
+                video_path,
+                (width, height),
+                (20, 50, 80),
+                [
+                    Overlay(f"SORA GENERATED\n{teaser_content.headline}", 20, 60),
+                    Overlay(f"Resolution: {width}x{height} | Duration: {duration}s | Generation ID: {gen_id}", 40, 30, 'lightgray', 0.7),
+                ],
+                duration,
+            )
             logger.success(f"Sora placeholder video created: {video_path} ({width}x{height})")
-        except ImportError:
-            logger.warning("MoviePy not available for Sora placeholder video generation - skipping video creation")
-            with open(video_path, 'wb') as f:
-                f.write(b"")
         except Exception as e:
             logger.error(f"Error creating Sora placeholder video: {str(e)}")
             raise
 
     async def _create_sora_success_placeholder(self, video_path: str, teaser_content: TeaserContent, generation_metadata: dict):
         """Create a success placeholder indicating real video was generated in Azure."""
+        width = generation_metadata.get('width', 1920)
+        height = generation_metadata.get('height', 1080)
+        duration = generation_metadata.get('n_seconds', teaser_content.duration_seconds)
+        gen_id = generation_metadata.get('id', 'unknown')
+        
         try:
-            from moviepy import ColorClip
-            try:
-                from moviepy import TextClip
-                from moviepy import CompositeVideoClip
-                has_text = True
-            except Exception:
-                CompositeVideoClip = None
-                TextClip = None
-                has_text = False
-
-            width = generation_metadata.get('width', 1920)
-            height = generation_metadata.get('height', 1080)
-            duration = generation_metadata.get('n_seconds', teaser_content.duration_seconds)
-
-            def build_and_write():
-                bg = ColorClip(size=(width, height), color=(0, 50, 100), duration=duration)
-                if has_text and CompositeVideoClip and TextClip:
-                    def t(txt, sz, color='white'):
-                        for kwargs in (
-                            {"text": txt, "font_size": sz, "color": color},
-                            {"text": txt, "fontsize": sz, "color": color},
-                            {"text": txt, "color": color},
-                        ):
-                            try:
-                                return TextClip(**kwargs)
-                            except Exception:
-                                continue
-                        return None
-                    clips = [bg]
-                    title = t("✅ VIDEO GENERATED SUCCESSFULLY", min(width//25, 48))
-                    if title is not None:
-                        clips.append(title.set_position(('center', height*0.2)).set_duration(duration))
-                    headline_clip = t(teaser_content.headline, min(width//30, 36), 'lightblue')
-                    if headline_clip is not None:
-                        clips.append(headline_clip.set_position(('center', height*0.4)).set_duration(duration))
-                    instr = t(f"🎬 Generated by Azure Sora\n🆔 {generation_metadata.get('id', 'unknown')}", min(width//40, 24))
-                    if instr is not None:
-                        clips.append(instr.set_position(('center', height*0.65)).set_duration(duration))
-                    meta = t(f"Resolution: {width}x{height} | Duration: {duration}s", min(width//50, 18), 'gray')
-                    if meta is not None:
-                        clips.append(meta.set_position(('center', height*0.85)).set_duration(duration))
-                    final = CompositeVideoClip(clips) if len(clips) > 1 else bg
-                else:
-                    final = bg
-                final.write_videofile(
-                    video_path,
-                    fps=24,
-                    codec='libx264',
-                    audio=False,
-                    preset='medium'
-                )
-                final.close()
-                bg.close()
-
-            await asyncio.get_event_loop().run_in_executor(None, build_and_write)
+            await _render_placeholder(
+                video_path,
+                (width, height),
+                (0, 50, 100),
+                [
+                    Overlay("✅ VIDEO GENERATED SUCCESSFULLY", 25, 48, 'white', 0.2),
+                    Overlay(teaser_content.headline, 30, 36, 'lightblue', 0.4),
+                    Overlay(f"🎬 Generated by Azure Sora\n🆔 {gen_id}", 40, 24, 'white', 0.65),
+                    Overlay(f"Resolution: {width}x{height} | Duration: {duration}s", 50, 18, 'gray', 0.85),
+                ],
+                duration,
+            )
             logger.success(f"Success placeholder created: {video_path} ({width}x{height})")
-        except ImportError:
-            logger.warning("MoviePy not available - creating empty placeholder video")
-            with open(video_path, 'wb') as f:
-                f.write(b"")
         except Exception as e:
             logger.error(f"Error creating success placeholder: {str(e)}")
             raise
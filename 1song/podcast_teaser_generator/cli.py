@@ -1,57 +1,180 @@
 """Command-line interface for the podcast teaser generator."""
 
 import asyncio
+import atexit
+import concurrent.futures
+import functools
 import os
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from loguru import logger
 
-from .workflow import TeaserGenerationWorkflow
-from .models import PodcastScript
 from .config import settings
-from .interactive_cli import InteractiveTeaserGenerator
+
+# Heavy modules (workflow/agents, interactive CLI, rich widgets, loguru) are imported inside the
+# commands that use them, so `--help` and `setup` don't load the whole generation stack.
+if TYPE_CHECKING:
+    from rich.progress import Progress
+    from .workflow import TeaserGenerationWorkflow
 
 
 console = Console()
 
 
-@click.group()
-@click.version_option()
-def cli():
-    """Podcast Teaser Generator - AI-powered social media teaser creation."""
-    pass
+@functools.lru_cache(maxsize=None)
+def _default_language() -> str:
+    """Default TTS locale for --language options, resolved once per process."""
+    return settings.azure_speech_language or 'en-US'
 
 
-@cli.command()
-@click.option('--title', '-t', required=True, help='Podcast episode title')
-@click.option('--script', '-s', type=click.Path(exists=True), help='Path to script file')
-@click.option('--text', help='Script text (alternative to --script)')
-@click.option('--output', '-o', default='./output', help='Output directory')
-def smart_generate(title: str, script: Optional[str], text: Optional[str], output: str):
-    """Generate teaser with intelligent script analysis and user interaction."""
-    from .interactive_cli import InteractiveTeaserGenerator
+_DURATION_HELP = f'Teaser duration in seconds (default: {settings.max_clip_duration})'
+
+
+@functools.lru_cache(maxsize=1)
+def _get_workflow() -> "TeaserGenerationWorkflow":
+    """Return the process-wide workflow so its agents and clients are built once."""
+    from .workflow import TeaserGenerationWorkflow
+    return TeaserGenerationWorkflow()
+
+
+_PROGRESS: Optional["Progress"] = None
+
+
+def _get_progress() -> "Progress":
+    """Return the process-wide spinner display, starting it on first use.
     
-    # Read script content
+    Commands add and remove their own tasks on it instead of each opening a Progress (and its
+    refresh thread); it is stopped once at interpreter exit.
+    """
+    global _PROGRESS
+    if _PROGRESS is None:
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        
+        _PROGRESS = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        )
+        _PROGRESS.start()
+        atexit.register(_PROGRESS.stop)
+    return _PROGRESS
+
+
+# (header, style) column specs for the result tables
+_ASSET_COLUMNS = (("Asset Type", "cyan"), ("File Path", "green"))
+_AUDIO_RESULT_COLUMNS = (("Project ID", "cyan"), ("Teaser Content", "green"), ("Audio Path", "magenta"))
+_VIDEO_RESULT_COLUMNS = (
+    ("Project ID", "cyan"),
+    ("Teaser Content", "green"),
+    ("Video Path", "yellow"),
+    ("Final Teaser", "magenta"),
+)
+_CONFIG_COLUMNS = (("Setting", "cyan"), ("Value", "green"))
+
+
+def _make_table(title: str, columns: tuple):
+    """Build an empty Rich table with the given (header, style) columns."""
+    from rich.table import Table
+    
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table
+
+
+def _assets_table(title: str, assets):
+    """Build the audio/video/final asset table for a generated project."""
+    table = _make_table(title, _ASSET_COLUMNS)
+    if assets:
+        if assets.audio_path:
+            table.add_row("Audio", assets.audio_path)
+        if assets.video_path:
+            table.add_row("Video", assets.video_path)
+        if assets.final_teaser_path:
+            table.add_row("Final Teaser", assets.final_teaser_path)
+    return table
+
+
+def _require_exactly_one(script: Optional[str], alt: Optional[str], alt_name: str = "--text") -> bool:
+    """Return True if exactly one of --script / ``alt_name`` was given, else print an error."""
+    if bool(script) == bool(alt):
+        console.print(f"[red]Error: Provide exactly one of --script or {alt_name}[/red]")
+        return False
+    return True
+
+
+def _require_script_or_text(script: Optional[str], text: Optional[str]) -> bool:
+    """Return True if --script or --text was given (--script wins if both), else print an error."""
+    if not script and not text:
+        console.print("[red]Error: Either --script or --text must be provided[/red]")
+        return False
+    return True
+
+
+# --force tokens for generate-resumable, as bits of a single step mask
+_FORCE_BITS = {"content": 1, "audio": 2, "video": 4, "compose": 8, "all": 15}
+
+
+def _parse_force(ctx, param, value: Optional[str]) -> int:
+    """Click callback turning ``--force content,video`` into a step bitmask."""
+    mask = 0
+    for token in (value or "").split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        bit = _FORCE_BITS.get(token)
+        if bit is None:
+            raise click.BadParameter(f"unknown step '{token}' (choose from {', '.join(_FORCE_BITS)})")
+        mask |= bit
+    return mask
+
+
+def _read_script_async(script: Optional[str], text: Optional[str] = None) -> "asyncio.Future":
+    """Start reading ``script`` on a worker thread immediately; the future resolves to its text.
+    
+    Falls back to ``text`` when no script path is given. Must be called from a running loop;
+    the read overlaps with whatever setup (e.g. workflow construction) happens before awaiting.
+    """
+    loop = asyncio.get_running_loop()
     if script:
-        with open(script, 'r', encoding='utf-8') as f:
-            content = f.read()
-    elif text:
-        content = text
-    else:
-        console.print("[red]Error: Must provide either --script or --text[/red]")
-        return
+        return loop.run_in_executor(None, Path(script).read_text)
+    future = loop.create_future()
+    future.set_result(text)
+    return future
+
+
+def _make_io_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Create the default executor for to_thread / run_in_executor(None, ...)."""
+    return concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 4) * 2),
+        thread_name_prefix="teaser-io",
+    )
+
+
+def _run_async(coro):
+    """``asyncio.run`` with a sized IO pool installed as the loop's default executor.
     
-    # Set output directory
-    settings.output_dir = output
+    Each command runs a single loop; ``asyncio.run`` shuts the pool down when that loop
+    finishes. Network clients opened on the loop are closed before it goes away.
+    """
+    async def _main():
+        asyncio.get_running_loop().set_default_executor(_make_io_pool())
+        try:
+            return await coro
+        finally:
+            if _get_workflow.cache_info().currsize:
+                await _get_workflow().aclose()
     
-    # Run interactive generation
-    generator = InteractiveTeaserGenerator()
-    asyncio.run(generator.generate_interactive_teaser(title, content))
+    return asyncio.run(_main())
+
+
+@click.group()
+@click.version_option()
+def cli():
+    """Podcast Teaser Generator - AI-powered social media teaser creation."""
+    pass
 
 
 @cli.command()
@@ -59,25 +182,13 @@ def smart_generate(title: str, script: Optional[str], text: Optional[str], outpu
 @click.option('--script', '-s', type=click.Path(exists=True), help='Path to script file')
 @click.option('--text', help='Script text (alternative to --script)')
 @click.option('--output', '-o', help='Output directory (default: ./output)')
-@click.option('--duration', '-d', type=int, help=f'Teaser duration in seconds (default: {settings.max_clip_duration})')
+@click.option('--duration', '-d', type=int, help=_DURATION_HELP)
 def generate(title: str, script: Optional[str], text: Optional[str], output: Optional[str], duration: Optional[int]):
     """Generate a social media teaser from a podcast script."""
     
-    if not script and not text:
-        console.print("[red]Error: Either --script or --text must be provided[/red]")
-        return
-    
-    if script and text:
-        console.print("[red]Error: Provide either --script or --text, not both[/red]")
+    if not _require_exactly_one(script, text):
         return
     
-    # Read script content
-    if script:
-        script_path = Path(script)
-        content = script_path.read_text()
-    else:
-        content = text
-    
     # Set output directory
     if output:
         settings.output_dir = output
@@ -89,26 +200,28 @@ def generate(title: str, script: Optional[str], text: Optional[str], output: Opt
     console.print(f"[green]Generating teaser for: {title}[/green]")
     console.print(f"[blue]Output directory: {settings.output_dir}[/blue]")
     
-    # Run the generation workflow
-    asyncio.run(_run_generation(title, content))
+    # Run the generation workflow (script file is read off the event loop)
+    async def _run():
+        await _run_generation(title, await _read_script_async(script, text))
+    
+    _run_async(_run())
 
 
-async def _run_generation(title: str, content: str):
-    """Run the teaser generation workflow with progress tracking."""
+async def _run_generation(title: str, content: str, progress: Optional["Progress"] = None):
+    """Run the teaser generation workflow with progress tracking.
     
-    workflow = TeaserGenerationWorkflow()
+    The task is added to ``progress`` (the shared display by default), so concurrent
+    generations in ``batch`` share one spinner area.
+    """
+    if progress is None:
+        progress = _get_progress()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        
-        task = progress.add_task("Initializing...", total=None)
-        
+    workflow = _get_workflow()
+    task = progress.add_task("Initializing...", total=None)
+    try:
         try:
             # Update progress for each step
-            progress.update(task, description="Extracting teaser content...")
+            progress.update(task, description=f"{title}: Extracting teaser content...")
             
             project = await workflow.generate_teaser_from_text(title, content)
             
@@ -116,19 +229,7 @@ async def _run_generation(title: str, content: str):
                 console.print("\n[green]✓ Teaser generation completed successfully![/green]")
                 
                 # Display results table
-                table = Table(title="Generated Assets")
-                table.add_column("Asset Type", style="cyan")
-                table.add_column("File Path", style="green")
-                
-                if project.generated_assets:
-                    if project.generated_assets.audio_path:
-                        table.add_row("Audio", project.generated_assets.audio_path)
-                    if project.generated_assets.video_path:
-                        table.add_row("Video", project.generated_assets.video_path)
-                    if project.generated_assets.final_teaser_path:
-                        table.add_row("Final Teaser", project.generated_assets.final_teaser_path)
-                
-                console.print(table)
+                console.print(_assets_table("Generated Assets", project.generated_assets))
                 
                 # Display teaser content
                 if project.teaser_content:
@@ -141,28 +242,64 @@ async def _run_generation(title: str, content: str):
                 
         except Exception as e:
             console.print(f"[red]✗ Error: {str(e)}[/red]")
+    finally:
+        progress.remove_task(task)
 
 
 @cli.command()
 @click.argument('directory', type=click.Path(exists=True))
-def batch(directory: str):
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), help='Maximum scripts processed at once (default: 4)')
+def batch(directory: str, concurrency: Optional[int]):
     """Process multiple script files in a directory."""
     
-    script_dir = Path(directory)
-    script_files = list(script_dir.glob("*.txt")) + list(script_dir.glob("*.md"))
+    # One directory pass; DirEntry caches the file type from the directory listing.
+    # Sort the plain names so batch order is deterministic, then build Paths once.
+    with os.scandir(directory) as it:
+        names = [
+            entry.name for entry in it
+            if entry.is_file() and entry.name.endswith((".txt", ".md"))
+        ]
+    names.sort()
+    base = Path(directory)
+    script_files = [base / name for name in names]
     
     if not script_files:
         console.print(f"[yellow]No script files found in {directory}[/yellow]")
         return
     
-    console.print(f"[green]Found {len(script_files)} script files[/green]")
+    limit = concurrency or getattr(settings, 'batch_concurrency', None) or 4
+    console.print(f"[green]Found {len(script_files)} script files[/green] (processing up to {limit} at once)")
     
-    for script_file in script_files:
-        title = script_file.stem  # Use filename as title
-        content = script_file.read_text()
-        
-        console.print(f"\n[blue]Processing: {script_file.name}[/blue]")
-        asyncio.run(_run_generation(title, content))
+    _run_async(_run_batch(script_files, limit))
+
+
+async def _run_batch(script_files: list, limit: int, prefetch: int = 4):
+    """Run generation for every script concurrently, at most ``limit`` at a time.
+    
+    Up to ``prefetch`` further scripts are read ahead while waiting for a free slot, so at most
+    ``limit + prefetch`` script texts are held in memory at once.
+    """
+    sem = asyncio.Semaphore(limit)
+    io_sem = asyncio.Semaphore(prefetch)
+    progress = _get_progress()
+    
+    async def _one(script_file: Path):
+        # The read-ahead slot is held until a processing slot frees up
+        async with io_sem:
+            content = await asyncio.to_thread(script_file.read_text)
+            await sem.acquire()
+        try:
+            title = script_file.stem  # Use filename as title
+            console.print(f"\n[blue]Processing: {script_file.name}[/blue]")
+            await _run_generation(title, content, progress)
+        finally:
+            sem.release()
+    
+    results = await asyncio.gather(*(_one(sf) for sf in script_files), return_exceptions=True)
+    
+    for script_file, result in zip(script_files, results):
+        if isinstance(result, Exception):
+            console.print(f"[red]✗ {script_file.name}: {result}[/red]")
 
 
 @cli.command("smart-generate")
@@ -173,14 +310,17 @@ def smart_generate(title: str, script: Path):
     
     console.print(f"[green]Starting intelligent teaser generation for: {title}[/green]")
     
-    try:
-        # Read script content
-        script_content = script.read_text()
-        
-        # Create and run interactive generator
+    from loguru import logger
+    from .interactive_cli import InteractiveTeaserGenerator
+    
+    async def _run():
+        # Read script content off the event loop while the generator is constructed
+        content_future = _read_script_async(str(script))
         generator = InteractiveTeaserGenerator()
-        asyncio.run(generator.generate_interactive_teaser(title, script_content))
-        
+        await generator.generate_interactive_teaser(title, await content_future)
+    
+    try:
+        _run_async(_run())
     except Exception as e:
         console.print(f"[red]Error during generation: {e}[/red]")
         logger.exception("Smart generation failed")
@@ -191,27 +331,24 @@ def smart_generate(title: str, script: Path):
 @click.option('--script', '-s', type=click.Path(exists=True), help='Path to script file')
 @click.option('--text', help='Script text (alternative to --script)')
 @click.option('--output', '-o', help='Output directory (default: ./output)')
-@click.option('--duration', '-d', type=int, help=f'Teaser duration in seconds (default: {settings.max_clip_duration})')
-@click.option('--force-content', is_flag=True, help='Force re-extraction of teaser content')
-@click.option('--force-audio', is_flag=True, help='Force re-generation of audio (TTS)')
-@click.option('--force-video', is_flag=True, help='Force re-generation of video')
-@click.option('--force-compose', is_flag=True, help='Force re-composition of final teaser')
-def generate_resumable(title: str, script: Optional[str], text: Optional[str], output: Optional[str], duration: Optional[int], force_content: bool, force_audio: bool, force_video: bool, force_compose: bool):
+@click.option('--duration', '-d', type=int, help=_DURATION_HELP)
+@click.option('--force', 'force', callback=_parse_force, metavar='STEPS',
+              help='Comma-separated steps to re-run: content,audio,video,compose or all')
+# Legacy per-step flags, kept as hidden aliases for --force
+@click.option('--force-content', is_flag=True, hidden=True)
+@click.option('--force-audio', is_flag=True, hidden=True)
+@click.option('--force-video', is_flag=True, hidden=True)
+@click.option('--force-compose', is_flag=True, hidden=True)
+def generate_resumable(title: str, script: Optional[str], text: Optional[str], output: Optional[str], duration: Optional[int], force: int, force_content: bool, force_audio: bool, force_video: bool, force_compose: bool):
     """Generate a teaser sequentially with resumable steps and force flags."""
     
-    if not script and not text:
-        console.print("[red]Error: Either --script or --text must be provided[/red]")
+    if not _require_exactly_one(script, text):
         return
-    if script and text:
-        console.print("[red]Error: Provide either --script or --text, not both[/red]")
-        return
-
-    # Read script content
-    if script:
-        script_path = Path(script)
-        content = script_path.read_text()
-    else:
-        content = text
+    
+    # Fold the legacy flags into the --force bitmask
+    for name, flag in (("content", force_content), ("audio", force_audio), ("video", force_video), ("compose", force_compose)):
+        if flag:
+            force |= _FORCE_BITS[name]
 
     # Set output directory
     if output:
@@ -224,34 +361,35 @@ def generate_resumable(title: str, script: Optional[str], text: Optional[str], o
     console.print(f"[green]Generating teaser (resumable) for: {title}[/green]")
     console.print(f"[blue]Output directory: {settings.output_dir}[/blue]")
 
-    asyncio.run(_run_generation_resumable(title, content, force_content, force_audio, force_video, force_compose))
+    async def _run():
+        content = await _read_script_async(script, text)
+        await _run_generation_resumable(title, content, force)
+
+    _run_async(_run())
 
 
-async def _run_generation_resumable(title: str, content: str, force_content: bool, force_audio: bool, force_video: bool, force_compose: bool):
-    """Run the sequential/resumable workflow."""
-    workflow = TeaserGenerationWorkflow()
-    project = await workflow.generate_teaser_sequential_resumable(
-        script=PodcastScript(title=title, content=content),
-        language=settings.azure_speech_language or 'en-US',
-        force_content=force_content,
-        force_audio=force_audio,
-        force_video=force_video,
-        force_compose=force_compose,
-    )
+async def _run_generation_resumable(title: str, content: str, force: int = 0):
+    """Run the sequential/resumable workflow; ``force`` is a ``_FORCE_BITS`` mask of steps to redo."""
+    from .models import PodcastScript
+    
+    workflow = _get_workflow()
+    progress = _get_progress()
+    task = progress.add_task(f"{title}: Running resumable steps...", total=None)
+    try:
+        project = await workflow.generate_teaser_sequential_resumable(
+            script=PodcastScript(title=title, content=content),
+            language=settings.azure_speech_language or 'en-US',
+            force_content=bool(force & _FORCE_BITS["content"]),
+            force_audio=bool(force & _FORCE_BITS["audio"]),
+            force_video=bool(force & _FORCE_BITS["video"]),
+            force_compose=bool(force & _FORCE_BITS["compose"]),
+        )
+    finally:
+        progress.remove_task(task)
 
     if project.status == "completed":
         console.print("\n[green]✓ Teaser generation (resumable) completed successfully![/green]")
-        table = Table(title="Generated Assets (Resumable)")
-        table.add_column("Asset Type", style="cyan")
-        table.add_column("File Path", style="green")
-        if project.generated_assets:
-            if project.generated_assets.audio_path:
-                table.add_row("Audio", project.generated_assets.audio_path)
-            if project.generated_assets.video_path:
-                table.add_row("Video", project.generated_assets.video_path)
-            if project.generated_assets.final_teaser_path:
-                table.add_row("Final Teaser", project.generated_assets.final_teaser_path)
-        console.print(table)
+        console.print(_assets_table("Generated Assets (Resumable)", project.generated_assets))
     else:
         console.print(f"[red]✗ Generation failed: {project.error_message}[/red]")
 
@@ -262,7 +400,7 @@ async def _run_generation_resumable(title: str, content: str, force_content: boo
 @click.option('--prompt', help='High-level prompt describing the episode (alternative to --script)')
 @click.option('--headline', help='Optional pre-written headline to enforce')
 @click.option('--duration', type=int, default=15, show_default=True, help='Target teaser duration seconds')
-@click.option('--language', default=lambda: settings.azure_speech_language or 'en-US', show_default=True, help='Language / locale for TTS (e.g. en-US, he-IL)')
+@click.option('--language', default=_default_language, show_default=True, help='Language / locale for TTS (e.g. en-US, he-IL)')
 @click.option('--gender', type=click.Choice(['male','female','auto']), default='auto', show_default=True, help='Preferred voice gender (auto lets system choose)')
 @click.option('--voice-name', help='Explicit Azure voice name override (takes precedence)')
 @click.option('--output', '-o', help='Output directory (default: ./output)')
@@ -270,25 +408,25 @@ async def _run_generation_resumable(title: str, content: str, force_content: boo
 @click.option('--force-audio', is_flag=True, help='Force re-generation of audio even if exists')
 def generate_audio_cmd(title: str, script: Optional[str], prompt: Optional[str], headline: Optional[str], duration: int, language: str, gender: str, voice_name: Optional[str], output: Optional[str], force_content: bool, force_audio: bool):
     """Audio-first flow using unified InputSpec (prompt OR script) producing teaser_content + audio."""
-    if not script and not prompt:
-        console.print("[red]Error: Provide either --script or --prompt[/red]")
-        return
-    if script and prompt:
-        console.print("[red]Error: Provide only one of --script or --prompt, not both[/red]")
+    if not _require_exactly_one(script, prompt, "--prompt"):
         return
 
-    full_script = Path(script).read_text() if script else None  # type: ignore[arg-type]
     if output:
         settings.output_dir = output
 
-    workflow = TeaserGenerationWorkflow()
     voice_gender = None if gender == 'auto' else gender
 
     async def _run():
+        # Script read runs on a worker thread while the workflow is constructed
+        script_future = _read_script_async(script)
+        workflow = _get_workflow()
+        from .models import PodcastScript as _PS
+        # One model holds the script text; it is also the full_script source for the spec step
+        script_model = _PS(title=title, content=await script_future or prompt or "")
         pid, content_path = await workflow.step_generate_from_input(
             title=title,
             prompt=prompt,
-            full_script=full_script,
+            full_script=script_model.content if script else None,
             headline=headline,
             target_duration=duration,
             language=language,
@@ -297,19 +435,13 @@ def generate_audio_cmd(title: str, script: Optional[str], prompt: Optional[str],
             force=force_content,
         )
         # Now TTS
-        from .models import PodcastScript as _PS
-        script_text = full_script or prompt or ""
-        script_model = _PS(title=title, content=script_text)
         _, audio_path = await workflow.step_tts(script_model, language=language, force=force_audio)
-        table = Table(title="Audio Generation Result")
-        table.add_column("Project ID", style="cyan")
-        table.add_column("Teaser Content", style="green")
-        table.add_column("Audio Path", style="magenta")
+        table = _make_table("Audio Generation Result", _AUDIO_RESULT_COLUMNS)
         table.add_row(pid, content_path, audio_path)
         console.print(table)
         console.print("[bold green]Next:[/bold green] When satisfied with audio run: \n  podcast-teaser generate-video-final --title '" + title + "' --script '<same script file>' (or --prompt '<same prompt>')")
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @cli.command("generate-video-final")
@@ -317,7 +449,7 @@ def generate_audio_cmd(title: str, script: Optional[str], prompt: Optional[str],
 @click.option('--script', '-s', type=click.Path(exists=True), help='Path to full script file (alternative to --prompt)')
 @click.option('--prompt', help='Same prompt used for audio phase (if prompt-based)')
 @click.option('--headline', help='Optional headline (should match if previously enforced)')
-@click.option('--language', default=lambda: settings.azure_speech_language or 'en-US', show_default=True, help='Language / locale (must match audio)')
+@click.option('--language', default=_default_language, show_default=True, help='Language / locale (must match audio)')
 @click.option('--gender', type=click.Choice(['male','female','auto']), default='auto', show_default=True, help='Voice gender (only used if audio missing)')
 @click.option('--voice-name', help='Explicit Azure voice name (only used if regenerating audio)')
 @click.option('--output', '-o', help='Output directory (default: ./output)')
@@ -326,25 +458,25 @@ def generate_audio_cmd(title: str, script: Optional[str], prompt: Optional[str],
 @click.option('--force-audio', is_flag=True, help='Force re-generation of audio before video (rare)')
 def generate_video_final_cmd(title: str, script: Optional[str], prompt: Optional[str], headline: Optional[str], language: str, gender: str, voice_name: Optional[str], output: Optional[str], force_video: bool, force_compose: bool, force_audio: bool):
     """After audio phase: ensure teaser content exists, ensure audio, then video + final compose."""
-    if not script and not prompt:
-        console.print("[red]Error: Provide either --script or --prompt[/red]")
-        return
-    if script and prompt:
-        console.print("[red]Error: Provide only one of --script or --prompt[/red]")
+    if not _require_exactly_one(script, prompt, "--prompt"):
         return
 
-    full_script = Path(script).read_text() if script else None  # type: ignore[arg-type]
     if output:
         settings.output_dir = output
-    workflow = TeaserGenerationWorkflow()
     voice_gender = None if gender == 'auto' else gender
 
     async def _run():
+        # Script read runs on a worker thread while the workflow is constructed
+        script_future = _read_script_async(script)
+        workflow = _get_workflow()
+        from .models import PodcastScript as _PS
+        # Single model shared by the spec, TTS, video and compose steps
+        script_model = _PS(title=title, content=await script_future or prompt or "")
         # (Re)create spec/content only if missing
         pid, content_path = await workflow.step_generate_from_input(
             title=title,
             prompt=prompt,
-            full_script=full_script,
+            full_script=script_model.content if script else None,
             headline=headline,
             # do not override duration here; rely on stored spec if exists
             target_duration=15,
@@ -353,21 +485,15 @@ def generate_video_final_cmd(title: str, script: Optional[str], prompt: Optional
             voice_name=voice_name,
             force=False,
         )
-        from .models import PodcastScript as _PS
-        script_model = _PS(title=title, content=full_script or prompt or "")
         await workflow.step_tts(script_model, language=language, force=force_audio)
         pid_v, video_path = await workflow.step_video(script_model, force=force_video)
         pid_f, final_path = await workflow.step_compose(script_model, language=language, force=force_compose)
-        table = Table(title="Video + Final Composition Result")
-        table.add_column("Project ID", style="cyan")
-        table.add_column("Teaser Content", style="green")
-        table.add_column("Video Path", style="yellow")
-        table.add_column("Final Teaser", style="magenta")
+        table = _make_table("Video + Final Composition Result", _VIDEO_RESULT_COLUMNS)
         table.add_row(pid_v, content_path, video_path, final_path)
         console.print(table)
         console.print("[bold green]Done.[/bold green] If you need a different voice re-run generate-audio with new params.")
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @cli.command()
@@ -377,17 +503,15 @@ def setup():
     console.print("[green]Setting up Podcast Teaser Generator...[/green]")
     
     # Create directories
-    os.makedirs(settings.output_dir, exist_ok=True)
-    os.makedirs(settings.temp_dir, exist_ok=True)
+    for directory in (settings.output_dir, settings.temp_dir):
+        Path(directory).mkdir(parents=True, exist_ok=True)
     
     # Check for .env file
     if not os.path.exists('.env'):
         console.print("[yellow]No .env file found. Copy .env.example to .env and configure your API keys.[/yellow]")
     
     # Display configuration
-    table = Table(title="Current Configuration")
-    table.add_column("Setting", style="cyan")
-    table.add_column("Value", style="green")
+    table = _make_table("Current Configuration", _CONFIG_COLUMNS)
     
     table.add_row("Output Directory", settings.output_dir)
     table.add_row("Temp Directory", settings.temp_dir)
@@ -412,12 +536,23 @@ def steps():
 @click.option('--text', help='Script text (alternative to --script)')
 @click.option('--force', is_flag=True, help='Force re-extraction')
 def step_extract_cmd(title: str, script: Optional[str], text: Optional[str], force: bool):
-    content = Path(script).read_text() if script else text
-    if not content:
-        console.print("[red]Error: Either --script or --text must be provided[/red]")
+    if not _require_script_or_text(script, text):
         return
-    workflow = TeaserGenerationWorkflow()
-    pid, path = asyncio.run(workflow.step_extract(PodcastScript(title=title, content=content), force=force))
+    
+    async def _run():
+        from .models import PodcastScript
+        content_future = _read_script_async(script, text)
+        workflow = _get_workflow()
+        content = await content_future
+        if not content:
+            console.print("[red]Error: Either --script or --text must be provided[/red]")
+            return None
+        return await workflow.step_extract(PodcastScript(title=title, content=content), force=force)
+    
+    result = _run_async(_run())
+    if result is None:
+        return
+    pid, path = result
     console.print(f"[green]Extracted teaser content for project {pid}[/green] -> {path}")
 
 
@@ -425,15 +560,26 @@ def step_extract_cmd(title: str, script: Optional[str], text: Optional[str], for
 @click.option('--title', '-t', required=True, help='Podcast episode title')
 @click.option('--script', '-s', type=click.Path(exists=True), help='Path to script file')
 @click.option('--text', help='Script text (alternative to --script)')
-@click.option('--language', default=lambda: settings.azure_speech_language or 'en-US')
+@click.option('--language', default=_default_language)
 @click.option('--force', is_flag=True, help='Force re-generate audio')
 def step_tts_cmd(title: str, script: Optional[str], text: Optional[str], language: str, force: bool):
-    content = Path(script).read_text() if script else text
-    if not content:
-        console.print("[red]Error: Either --script or --text must be provided[/red]")
+    if not _require_script_or_text(script, text):
+        return
+    
+    async def _run():
+        from .models import PodcastScript
+        content_future = _read_script_async(script, text)
+        workflow = _get_workflow()
+        content = await content_future
+        if not content:
+            console.print("[red]Error: Either --script or --text must be provided[/red]")
+            return None
+        return await workflow.step_tts(PodcastScript(title=title, content=content), language=language, force=force)
+    
+    result = _run_async(_run())
+    if result is None:
         return
-    workflow = TeaserGenerationWorkflow()
-    pid, path = asyncio.run(workflow.step_tts(PodcastScript(title=title, content=content), language=language, force=force))
+    pid, path = result
     console.print(f"[green]Generated audio for project {pid}[/green] -> {path}")
 
 
@@ -443,12 +589,23 @@ def step_tts_cmd(title: str, script: Optional[str], text: Optional[str], languag
 @click.option('--text', help='Script text (alternative to --script)')
 @click.option('--force', is_flag=True, help='Force re-generate video')
 def step_video_cmd(title: str, script: Optional[str], text: Optional[str], force: bool):
-    content = Path(script).read_text() if script else text
-    if not content:
-        console.print("[red]Error: Either --script or --text must be provided[/red]")
+    if not _require_script_or_text(script, text):
+        return
+    
+    async def _run():
+        from .models import PodcastScript
+        content_future = _read_script_async(script, text)
+        workflow = _get_workflow()
+        content = await content_future
+        if not content:
+            console.print("[red]Error: Either --script or --text must be provided[/red]")
+            return None
+        return await workflow.step_video(PodcastScript(title=title, content=content), force=force)
+    
+    result = _run_async(_run())
+    if result is None:
         return
-    workflow = TeaserGenerationWorkflow()
-    pid, path = asyncio.run(workflow.step_video(PodcastScript(title=title, content=content), force=force))
+    pid, path = result
     console.print(f"[green]Generated video for project {pid}[/green] -> {path}")
 
 
@@ -456,27 +613,65 @@ def step_video_cmd(title: str, script: Optional[str], text: Optional[str], force
 @click.option('--title', '-t', required=True, help='Podcast episode title')
 @click.option('--script', '-s', type=click.Path(exists=True), help='Path to script file')
 @click.option('--text', help='Script text (alternative to --script)')
-@click.option('--language', default=lambda: settings.azure_speech_language or 'en-US')
+@click.option('--language', default=_default_language)
 @click.option('--force', is_flag=True, help='Force re-compose final')
 def step_compose_cmd(title: str, script: Optional[str], text: Optional[str], language: str, force: bool):
-    content = Path(script).read_text() if script else text
-    if not content:
-        console.print("[red]Error: Either --script or --text must be provided[/red]")
+    if not _require_script_or_text(script, text):
+        return
+    
+    async def _run():
+        from .models import PodcastScript
+        content_future = _read_script_async(script, text)
+        workflow = _get_workflow()
+        content = await content_future
+        if not content:
+            console.print("[red]Error: Either --script or --text must be provided[/red]")
+            return None
+        return await workflow.step_compose(PodcastScript(title=title, content=content), language=language, force=force)
+    
+    result = _run_async(_run())
+    if result is None:
         return
-    workflow = TeaserGenerationWorkflow()
-    pid, path = asyncio.run(workflow.step_compose(PodcastScript(title=title, content=content), language=language, force=force))
+    pid, path = result
     console.print(f"[green]Composed final teaser for project {pid}[/green] -> {path}")
 
 
-def main():
-    """Main entry point for the CLI."""
-    # Configure logging
+def _install_fast_event_loop() -> None:
+    """Use uvloop (or winloop on Windows) for asyncio.run when available."""
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        try:
+            import winloop
+            winloop.install()
+        except ImportError:
+            pass
+
+
+_LOG_CONFIGURED = False
+
+
+def _configure_logging() -> None:
+    """Route loguru through the Rich console; only the first call per process has an effect."""
+    global _LOG_CONFIGURED
+    if _LOG_CONFIGURED:
+        return
+    from loguru import logger
+    
     logger.remove()
     logger.add(
         lambda msg: console.print(msg, highlight=False),
         level=settings.log_level,
         format="<level>{time:HH:mm:ss}</level> | <level>{message}</level>"
     )
+    _LOG_CONFIGURED = True
+
+
+def main():
+    """Main entry point for the CLI."""
+    _install_fast_event_loop()
+    _configure_logging()
     
     cli()
 
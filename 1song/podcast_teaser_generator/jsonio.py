@@ -0,0 +1,31 @@
+"""JSON encode/decode helpers shared by the workflow and agents (orjson when installed)."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
+
+def loads(raw: bytes):
+    """Decode JSON bytes with orjson when installed, else stdlib json."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def dumps(data) -> bytes:
+    """Indented (2-space) JSON bytes for a pydantic model or plain dict; orjson when installed."""
+    if orjson is not None:
+        try:
+            payload = data.model_dump(mode="json") if hasattr(data, "model_dump") else data
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    if hasattr(data, "model_dump_json"):
+        return data.model_dump_json(indent=2).encode("utf-8")
+    return json.dumps(data, indent=2).encode("utf-8")
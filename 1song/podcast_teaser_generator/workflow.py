@@ -1,25 +1,140 @@
 """Core agentic workflow orchestrator."""
 
 import asyncio
+import functools
 import uuid
+from dataclasses import dataclass
 from typing import Optional
 from loguru import logger
 
 from .models import PodcastScript, TeaserProject, TeaserContent, GeneratedAssets, InputSpec, ScriptAnalysis
-from .agents.content_agent import ContentExtractionAgent
+from .agents.content_agent import ContentExtractionAgent, aclose_shared_clients
 from .agents.audio_agent import AudioGenerationAgent
 from .agents.video_agent import VideoGenerationAgent
 from .agents.compositor_agent import CompositorAgent
 from .config import settings
+from .jsonio import dumps, loads
 from .mcp_client import mcp_manager
 
 # New imports for resumable workflow
+import errno
 import os
-import json
 import hashlib
+import shutil
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=64)
+def _stable_id(title: str, content: str) -> str:
+    """Stable project id for a script: first 12 hex chars of sha1(title|content).
+    
+    Cached because every step of a run re-derives it from the same (possibly large) script;
+    str objects cache their own hash, so repeat lookups don't rescan the text.
+    """
+    # Fed piecewise (same digest as sha1 of "title|content") to avoid building the joined copy
+    digest = hashlib.sha1(title.encode("utf-8"))
+    digest.update(b"|")
+    digest.update(content.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _staging_path(target: Path) -> str:
+    """Sibling temp path (same directory and extension) for an agent to write ``target`` into."""
+    return str(target.with_name(f"{target.stem}.tmp-{uuid.uuid4().hex[:8]}{target.suffix}"))
+
+
+def _write_atomic(path: Path, data) -> None:
+    """Write ``data`` (str or bytes) to ``path`` in one write and publish it with ``os.replace``.
+    
+    Readers of the next step never observe a half-written JSON file. A bytes payload larger than
+    the io buffer goes straight to a single ``write`` call instead of text-mode chunking.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    """Serialize ``data`` (model or dict) and write it atomically; run via ``asyncio.to_thread``."""
+    _write_atomic(path, dumps(data))
+
+
+def _read_json(path: Path):
+    """Read and decode a JSON file; run via ``asyncio.to_thread``."""
+    return loads(path.read_bytes())
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectPaths:
+    """Canonical artifact locations of one resumable project (``<output_dir>/<stable id>/``)."""
+    id: str
+    dir: Path
+    content_json: Path
+    spec_json: Path
+    metadata_json: Path
+    audio: Path
+    video: Path
+    final: Path
+
+    @classmethod
+    def build(cls, output_dir: str, stable_id: str) -> "ProjectPaths":
+        """Derive all paths for ``stable_id`` under ``output_dir`` using the configured formats."""
+        project_dir = Path(output_dir) / stable_id
+        return cls(
+            id=stable_id,
+            dir=project_dir,
+            content_json=project_dir / "teaser_content.json",
+            spec_json=project_dir / "input_spec.json",
+            metadata_json=project_dir / "metadata.json",
+            audio=project_dir / f"audio.{settings.output_audio_format}",
+            video=project_dir / f"video.{settings.output_video_format}",
+            final=project_dir / f"final.{settings.output_video_format}",
+        )
+
+
+async def _run_media(audio_coro, video_coro, on_ready=None) -> tuple:
+    """Run the audio and video coroutines concurrently; returns (audio_path, video_path).
+    
+    ``on_ready(kind)`` is called with "audio" / "video" as soon as that branch finishes, so the
+    (usually much faster) audio result is reported without waiting for the video.
+    Uses a TaskGroup where available so a failure in one branch cancels the other right away;
+    the first failure is re-raised as-is rather than wrapped in an ExceptionGroup.
+    """
+    if on_ready is not None:
+        async def _tagged(kind, coro):
+            result = await coro
+            on_ready(kind)
+            return result
+        
+        audio_coro = _tagged("audio", audio_coro)
+        video_coro = _tagged("video", video_coro)
+    
+    if not hasattr(asyncio, "TaskGroup"):
+        return tuple(await asyncio.gather(audio_coro, video_coro))
+    try:
+        async with asyncio.TaskGroup() as tg:
+            audio_task = tg.create_task(audio_coro)
+            video_task = tg.create_task(video_coro)
+    except BaseExceptionGroup as eg:
+        raise eg.exceptions[0]
+    return audio_task.result(), video_task.result()
+
+
+def _media_ready_callback(project: "TeaserProject"):
+    """Return an ``on_ready`` hook that marks ``project`` as audio_ready / video_ready."""
+    def _on_ready(kind: str) -> None:
+        logger.info(f"{kind.capitalize()} ready for project {project.id}")
+        project.update_status(f"{kind}_ready")
+    return _on_ready
+
+
 class TeaserGenerationWorkflow:
     """Main workflow orchestrator for teaser generation."""
     
@@ -30,6 +145,55 @@ class TeaserGenerationWorkflow:
         self.video_agent = VideoGenerationAgent()
         self.compositor_agent = CompositorAgent()
         self._mcp_initialized = False
+        # path -> (mtime_ns, size, raw dict, TeaserContent) for teaser_content.json files
+        self._teaser_cache: dict[str, tuple[int, int, dict, TeaserContent]] = {}
+        # (output_dir, stable id) -> ProjectPaths
+        self._project_paths_cache: dict[tuple[str, str], ProjectPaths] = {}
+    
+    def _artifact_size(self, path: Path) -> int:
+        """Size of a generated media file, or 0 if it doesn't exist.
+        
+        Always a fresh stat: a workflow can outlive its artifacts (the web UI keeps one for the
+        whole process), so files deleted or rewritten behind its back must not count as present.
+        """
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+    
+    def _publish_artifact(self, src: str, target: Path) -> None:
+        """Move a freshly generated file to its canonical path.
+        
+        Agents given a ``_staging_path`` write next to ``target``, so this is a same-filesystem
+        rename; outputs from elsewhere (e.g. a temp dir on another device) are moved instead.
+        """
+        try:
+            os.replace(src, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(src, target)
+    
+    async def _load_teaser_content(self, path: Path) -> tuple[dict, "TeaserContent"]:
+        """Load ``teaser_content.json`` as (raw dict, TeaserContent), reusing the last parse.
+        
+        The entry is keyed by the file's mtime and size, so a rewrite (e.g. a forced
+        extraction) is picked up while repeated steps of one run skip the re-parse.
+        """
+        st = await asyncio.to_thread(path.stat)
+        cached = self._teaser_cache.get(str(path))
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2], cached[3]
+        raw = await asyncio.to_thread(_read_json, path)
+        # Extra voice/language keys in the file are ignored by validation (pydantic's default)
+        teaser_content = TeaserContent.model_validate(raw)
+        self._teaser_cache[str(path)] = (st.st_mtime_ns, st.st_size, raw, teaser_content)
+        return raw, teaser_content
+    
+    async def aclose(self):
+        """Close the agents' network clients (HTTP sessions, OpenAI connection pools) at shutdown."""
+        await self.video_agent.aclose()
+        await aclose_shared_clients()
     
     async def _ensure_mcp_initialized(self):
         """Ensure MCP manager is initialized."""
@@ -74,10 +238,11 @@ class TeaserGenerationWorkflow:
             logger.info("Generating enhanced audio and video assets...")
             
             # Pass analysis context to agents if available
-            audio_task = self.audio_agent.generate_audio(teaser_content, language)
-            video_task = self.video_agent.generate_video(teaser_content)
-            
-            audio_path, video_path = await asyncio.gather(audio_task, video_task)
+            audio_path, video_path = await _run_media(
+                self.audio_agent.generate_audio(teaser_content, language),
+                self.video_agent.generate_video(teaser_content),
+                on_ready=_media_ready_callback(project),
+            )
             
             # Step 2: Compose final teaser
             project.update_status("compositing")
@@ -132,10 +297,9 @@ class TeaserGenerationWorkflow:
         try:
             logger.info(f"Starting teaser generation for project {project.id}")
             
-            # Step 1: Extract teaser content
+            # Step 1: Extract teaser content (the content agent caches successful extractions)
             project.update_status("extracting_content")
             logger.info("Extracting teaser content from script...")
-            
             teaser_content = await self.content_agent.extract_teaser_content(script)
             project.teaser_content = teaser_content
             
@@ -143,10 +307,11 @@ class TeaserGenerationWorkflow:
             project.update_status("generating_media")
             logger.info("Generating audio and video assets...")
             
-            audio_task = self.audio_agent.generate_audio(teaser_content, language)
-            video_task = self.video_agent.generate_video(teaser_content)
-            
-            audio_path, video_path = await asyncio.gather(audio_task, video_task)
+            audio_path, video_path = await _run_media(
+                self.audio_agent.generate_audio(teaser_content, language),
+                self.video_agent.generate_video(teaser_content),
+                on_ready=_media_ready_callback(project),
+            )
             
             # Step 3: Compose final teaser
             project.update_status("compositing")
@@ -205,58 +370,58 @@ class TeaserGenerationWorkflow:
         await self._ensure_mcp_initialized()
 
         # Stable project id derived from content for resumability
-        stable_id = hashlib.sha1(f"{script.title}|{script.content}".encode("utf-8")).hexdigest()[:12]
-        project_dir = Path(settings.output_dir) / stable_id
-        project_dir.mkdir(parents=True, exist_ok=True)
+        paths = self._project_paths(script)
+        stable_id = paths.id
 
         project = TeaserProject(id=stable_id, original_script=script)
         logger.info(f"Starting sequential/resumable generation for project {stable_id}")
 
         # Paths
-        content_json = project_dir / "teaser_content.json"
-        audio_target = project_dir / f"audio.{settings.output_audio_format}"
-        video_target = project_dir / f"video.{settings.output_video_format}"
-        final_target = project_dir / f"final.{settings.output_video_format}"
+        content_json = paths.content_json
+        audio_target = paths.audio
+        video_target = paths.video
+        final_target = paths.final
+
+        # Fast path: the finished teaser is already there and nothing is forced, so skip the
+        # content parse and the per-step reuse checks entirely
+        forced = force_content or force_audio or force_video or force_compose
+        if not forced and self._artifact_size(final_target) > 1024:
+            logger.info(f"Reusing existing final teaser: {final_target}")
+            project.generated_assets = GeneratedAssets(
+                audio_path=str(audio_target),
+                video_path=str(video_target),
+                final_teaser_path=str(final_target),
+                generation_metadata={
+                    "language": language,
+                    "forced": {"content": False, "audio": False, "video": False, "compose": False},
+                },
+            )
+            project.update_status("completed")
+            return project
 
         try:
             # Step 1: Extract teaser content
             project.update_status("extracting_content")
             if content_json.exists() and not force_content:
                 logger.info(f"Reusing existing teaser content: {content_json}")
-                teaser_content = TeaserContent(**json.loads(content_json.read_text()))
+                _, teaser_content = await self._load_teaser_content(content_json)
             else:
                 logger.info("Extracting teaser content from script...")
                 teaser_content = await self.content_agent.extract_teaser_content(script)
-                content_json.write_text(teaser_content.model_dump_json(indent=2))
+                await asyncio.to_thread(_write_json_atomic, content_json, teaser_content)
             project.teaser_content = teaser_content
 
-            # Step 2: Generate audio
-            project.update_status("generating_audio")
-            if audio_target.exists() and audio_target.stat().st_size > 0 and not force_audio:
-                logger.info(f"Reusing existing audio: {audio_target}")
-                audio_path = str(audio_target)
-            else:
-                logger.info("Generating TTS audio...")
-                gen_audio_path = await self.audio_agent.generate_audio(teaser_content, language)
-                # Move to canonical path
-                os.replace(gen_audio_path, audio_target)
-                audio_path = str(audio_target)
-
-            # Step 3: Generate video
-            project.update_status("generating_video")
-            if video_target.exists() and video_target.stat().st_size > 1024 and not force_video:
-                logger.info(f"Reusing existing video: {video_target}")
-                video_path = str(video_target)
-            else:
-                logger.info("Generating video...")
-                gen_video_path = await self.video_agent.generate_video(teaser_content)
-                # Move to canonical path
-                os.replace(gen_video_path, video_target)
-                video_path = str(video_target)
+            # Steps 2 + 3: audio and video only depend on the teaser content, so run them together
+            project.update_status("generating_media")
+            audio_path, video_path = await _run_media(
+                self._resumable_audio(teaser_content, language, audio_target, force_audio),
+                self._resumable_video(teaser_content, video_target, force_video),
+                on_ready=_media_ready_callback(project),
+            )
 
-            # Step 4: Compose final teaser
+            # Step 4: Compose final teaser (needs both media files)
             project.update_status("compositing")
-            if final_target.exists() and final_target.stat().st_size > 1024 and not force_compose:
+            if self._artifact_size(final_target) > 1024 and not force_compose:
                 logger.info(f"Reusing existing final teaser: {final_target}")
                 final_teaser_path = str(final_target)
             else:
@@ -265,9 +430,10 @@ class TeaserGenerationWorkflow:
                     audio_path=audio_path,
                     video_path=video_path,
                     project_id=stable_id,
+                    output_path=_staging_path(final_target),
                 )
                 # Move to canonical path
-                os.replace(composed_path, final_target)
+                self._publish_artifact(composed_path, final_target)
                 final_teaser_path = str(final_target)
 
             # Save metadata
@@ -280,7 +446,7 @@ class TeaserGenerationWorkflow:
                     "compose": force_compose,
                 },
             }
-            (project_dir / "metadata.json").write_text(json.dumps(metadata, indent=2))
+            await asyncio.to_thread(_write_json_atomic, paths.metadata_json, metadata)
 
             # Update project assets
             project.generated_assets = GeneratedAssets(
@@ -297,18 +463,51 @@ class TeaserGenerationWorkflow:
             logger.error(f"Error in sequential/resumable generation: {e}")
             return project
 
-    def _stable_id_and_dir(self, script: "PodcastScript"):
-        """Compute stable id and project directory for a script."""
-        stable_id = hashlib.sha1(f"{script.title}|{script.content}".encode("utf-8")).hexdigest()[:12]
-        project_dir = Path(settings.output_dir) / stable_id
-        project_dir.mkdir(parents=True, exist_ok=True)
-        return stable_id, project_dir
+    async def _resumable_audio(self, teaser_content: "TeaserContent", language: str, audio_target: Path, force: bool) -> str:
+        """Reuse ``audio_target`` if present, else generate TTS audio and move it there."""
+        if self._artifact_size(audio_target) > 0 and not force:
+            logger.info(f"Reusing existing audio: {audio_target}")
+            return str(audio_target)
+        logger.info("Generating TTS audio...")
+        gen_audio_path = await self.audio_agent.generate_audio(teaser_content, language)
+        # Move to canonical path
+        self._publish_artifact(gen_audio_path, audio_target)
+        return str(audio_target)
+
+    async def _resumable_video(self, teaser_content: "TeaserContent", video_target: Path, force: bool) -> str:
+        """Reuse ``video_target`` if present, else generate the video and move it there."""
+        if self._artifact_size(video_target) > 1024 and not force:
+            logger.info(f"Reusing existing video: {video_target}")
+            return str(video_target)
+        logger.info("Generating video...")
+        gen_video_path = await self.video_agent.generate_video(
+            teaser_content, output_path=_staging_path(video_target), force=force
+        )
+        # Move to canonical path
+        self._publish_artifact(gen_video_path, video_target)
+        self.video_agent.video_published(gen_video_path, str(video_target))
+        return str(video_target)
+
+    def _project_paths(self, script: "PodcastScript") -> ProjectPaths:
+        """Stable id and artifact paths for a script; the project directory is (re)created if missing."""
+        key = (str(settings.output_dir), _stable_id(script.title, script.content))
+        paths = self._project_paths_cache.get(key)
+        if paths is None:
+            paths = ProjectPaths.build(*key)
+            self._project_paths_cache[key] = paths
+        # Not skipped for cached entries: the directory may have been removed since
+        paths.dir.mkdir(parents=True, exist_ok=True)
+        return paths
+
+    def compute_stable_id(self, title: str, prompt: str | None = None, full_script: str | None = None) -> str:
+        """Project id ``step_generate_from_input`` will use for these inputs (hash only, no I/O)."""
+        return _stable_id(title, full_script or prompt or "")
 
     async def step_extract(self, script: "PodcastScript", force: bool = False) -> tuple[str, str]:
         """Extract teaser content and persist it. Returns (project_id, content_json_path)."""
         await self._ensure_mcp_initialized()
-        pid, pdir = self._stable_id_and_dir(script)
-        content_json = pdir / "teaser_content.json"
+        paths = self._project_paths(script)
+        pid, content_json = paths.id, paths.content_json
 
         if content_json.exists() and not force:
             logger.info(f"Reusing existing teaser content: {content_json}")
@@ -316,7 +515,7 @@ class TeaserGenerationWorkflow:
 
         logger.info("Extracting teaser content from script...")
         teaser_content = await self.content_agent.extract_teaser_content(script)
-        content_json.write_text(teaser_content.model_dump_json(indent=2))
+        await asyncio.to_thread(_write_json_atomic, content_json, teaser_content)
         logger.success(f"Saved teaser content: {content_json}")
         return pid, str(content_json)
 
@@ -326,21 +525,17 @@ class TeaserGenerationWorkflow:
         Now supports gender / voice overrides via metadata in teaser_content.json if present.
         """
         await self._ensure_mcp_initialized()
-        pid, pdir = self._stable_id_and_dir(script)
-        content_json = pdir / "teaser_content.json"
-        audio_target = pdir / f"audio.{settings.output_audio_format}"
+        paths = self._project_paths(script)
+        pid, content_json, audio_target = paths.id, paths.content_json, paths.audio
 
         # Ensure content
         if not content_json.exists():
             await self.step_extract(script, force=False)
-        teaser_raw = json.loads(content_json.read_text())
+        teaser_raw, teaser_content = await self._load_teaser_content(content_json)
         gender = teaser_raw.get("voice_gender")
         voice_name = teaser_raw.get("voice_name")
-        teaser_content = TeaserContent(**{k: v for k, v in teaser_raw.items() if k in {
-            "headline", "script", "key_points", "visual_description", "duration_seconds"
-        }})
 
-        if audio_target.exists() and audio_target.stat().st_size > 0 and not force:
+        if self._artifact_size(audio_target) > 0 and not force:
             logger.info(f"Reusing existing audio: {audio_target}")
             return pid, str(audio_target)
 
@@ -351,47 +546,59 @@ class TeaserGenerationWorkflow:
             gender=gender,
             voice_name=voice_name,
         )
-        os.replace(gen_audio_path, audio_target)
+        self._publish_artifact(gen_audio_path, audio_target)
         logger.success(f"Saved audio: {audio_target}")
         return pid, str(audio_target)
 
     async def step_video(self, script: "PodcastScript", force: bool = False) -> tuple[str, str]:
         """Generate/resume video. Returns (project_id, video_path)."""
         await self._ensure_mcp_initialized()
-        pid, pdir = self._stable_id_and_dir(script)
-        content_json = pdir / "teaser_content.json"
-        video_target = pdir / f"video.{settings.output_video_format}"
+        paths = self._project_paths(script)
+        pid, content_json, video_target = paths.id, paths.content_json, paths.video
 
         # Ensure content
         if not content_json.exists():
             await self.step_extract(script, force=False)
-        teaser_content = TeaserContent(**json.loads(content_json.read_text()))
+        _, teaser_content = await self._load_teaser_content(content_json)
 
-        if video_target.exists() and video_target.stat().st_size > 1024 and not force:
+        if self._artifact_size(video_target) > 1024 and not force:
             logger.info(f"Reusing existing video: {video_target}")
             return pid, str(video_target)
 
         logger.info("Generating video...")
-        gen_video_path = await self.video_agent.generate_video(teaser_content)
-        os.replace(gen_video_path, video_target)
+        gen_video_path = await self.video_agent.generate_video(
+            teaser_content, output_path=_staging_path(video_target), force=force
+        )
+        self._publish_artifact(gen_video_path, video_target)
+        self.video_agent.video_published(gen_video_path, str(video_target))
         logger.success(f"Saved video: {video_target}")
         return pid, str(video_target)
 
+    async def step_compose_prep(self, script: "PodcastScript", force: bool = False) -> None:
+        """Get composition ready while audio/video are still being produced (no media needed).
+
+        Only warms up the compositor's worker process; failures are logged, never raised.
+        """
+        if self._artifact_size(self._project_paths(script).final) > 1024 and not force:
+            return
+        try:
+            await self.compositor_agent.prepare()
+        except Exception as e:
+            logger.warning(f"Compositor warm-up failed (compose will start cold): {e}")
+
     async def step_compose(self, script: "PodcastScript", language: str = "en-US", force: bool = False) -> tuple[str, str]:
         """Compose/resume final teaser. Returns (project_id, final_path)."""
         await self._ensure_mcp_initialized()
-        pid, pdir = self._stable_id_and_dir(script)
-        audio_target = pdir / f"audio.{settings.output_audio_format}"
-        video_target = pdir / f"video.{settings.output_video_format}"
-        final_target = pdir / f"final.{settings.output_video_format}"
+        paths = self._project_paths(script)
+        pid, audio_target, video_target, final_target = paths.id, paths.audio, paths.video, paths.final
 
         # Ensure prerequisites
-        if not audio_target.exists() or audio_target.stat().st_size == 0:
+        if self._artifact_size(audio_target) == 0:
             await self.step_tts(script, language=language, force=False)
-        if not video_target.exists() or video_target.stat().st_size < 1024:
+        if self._artifact_size(video_target) < 1024:
             await self.step_video(script, force=False)
 
-        if final_target.exists() and final_target.stat().st_size > 1024 and not force:
+        if self._artifact_size(final_target) > 1024 and not force:
             logger.info(f"Reusing existing final teaser: {final_target}")
             return pid, str(final_target)
 
@@ -400,8 +607,9 @@ class TeaserGenerationWorkflow:
             audio_path=str(audio_target),
             video_path=str(video_target),
             project_id=pid,
+            output_path=_staging_path(final_target),
         )
-        os.replace(composed_path, final_target)
+        self._publish_artifact(composed_path, final_target)
         logger.success(f"Saved final teaser: {final_target}")
         return pid, str(final_target)
 
@@ -428,9 +636,8 @@ class TeaserGenerationWorkflow:
 
         source_text = full_script or prompt or ""
         script_model = PodcastScript(title=title, content=source_text)
-        pid, pdir = self._stable_id_and_dir(script_model)
-        content_json = pdir / "teaser_content.json"
-        spec_json = pdir / "input_spec.json"
+        paths = self._project_paths(script_model)
+        pid, content_json, spec_json = paths.id, paths.content_json, paths.spec_json
 
         if content_json.exists() and not force:
             logger.info(f"Reusing existing teaser content: {content_json}")
@@ -451,13 +658,13 @@ class TeaserGenerationWorkflow:
 
         teaser = await self.content_agent.generate_teaser_from_input(spec, title=title)
         # Persist spec & teaser (augment teaser with voice metadata for downstream audio)
-        spec_json.write_text(spec.model_dump_json(indent=2))
+        await asyncio.to_thread(_write_json_atomic, spec_json, spec)
         teaser_dict = teaser.model_dump()
         teaser_dict["voice_gender"] = voice_gender
         teaser_dict["voice_name"] = voice_name
         teaser_dict["language"] = language
         if spec.visual_style:
             teaser_dict["visual_style"] = spec.visual_style
-        content_json.write_text(json.dumps(teaser_dict, indent=2))
+        await asyncio.to_thread(_write_json_atomic, content_json, teaser_dict)
         logger.success(f"Saved teaser content (from input spec): {content_json}")
         return pid, str(content_json)
@@ -5,19 +5,47 @@ Adds mounts for:
  - /output  -> generated project assets (audio/video/final)
 """
 from fastapi import FastAPI
+from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import ui
 from podcast_teaser_generator.config import settings
+import argparse
+import contextlib
 import os, sys
 
-app = FastAPI(title="Podcast Teaser Generator UI", version="0.1.0")
+# Generated media is tens of MB; stream it in 1 MiB reads instead of Starlette's 64 KiB default
+_MEDIA_CHUNK_SIZE = 1024 * 1024
 
-# CORS (adjust as needed)
+
+class MediaStaticFiles(StaticFiles):
+    """StaticFiles for large media: fewer, larger file reads (and worker-thread hops) per download.
+
+    Range requests, ETag and Last-Modified handling are unchanged.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        if isinstance(response, FileResponse):
+            response.chunk_size = _MEDIA_CHUNK_SIZE
+        return response
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # Close aiohttp/httpx sessions so shutdown doesn't leak (or warn about) open connections
+    await ui.shutdown()
+
+
+app = FastAPI(title="Podcast Teaser Generator UI", version="0.1.0", lifespan=_lifespan)
+
+# CORS (adjust as needed). No cookies/auth are used, so credentials stay off and the wildcard
+# origin is sent as a static header instead of echoing each request's Origin.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_credentials=True,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -25,7 +53,21 @@ app.add_middleware(
 app.include_router(ui.router)
 app.mount("/static", StaticFiles(directory="teaser_web/static"), name="static")
 # Serve generated teaser assets (audio/video/final compositions)
-app.mount("/output", StaticFiles(directory=settings.output_dir), name="output")
+app.mount("/output", MediaStaticFiles(directory=settings.output_dir), name="output")
+
+
+def _parse_run_args(argv: list) -> tuple:
+    """Parse ``run()`` flags in one pass; returns (host, port, reload). Unknown args are ignored."""
+    parser = argparse.ArgumentParser(prog="podcast-teaser-web")
+    parser.add_argument("--host", "-H", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", "-p", default=os.environ.get("PORT", "8000"))
+    parser.add_argument("--no-reload", dest="reload", action="store_false")
+    args, _ = parser.parse_known_args(argv)
+    try:
+        port = int(args.port)
+    except ValueError:
+        port = 8000
+    return args.host, port, args.reload
 
 
 def run():  # console script entry point
@@ -40,23 +82,5 @@ def run():  # console script entry point
     """
     import uvicorn
 
-    # Very lightweight manual arg parsing to avoid adding dependencies
-    argv = sys.argv[1:]
-    def _extract(flag_names, default=None):
-        for i, a in enumerate(argv):
-            if a in flag_names and i + 1 < len(argv):
-                try:
-                    return argv[i + 1]
-                except Exception:
-                    return default
-        return default
-
-    host = _extract(["--host", "-H"], os.environ.get("HOST", "0.0.0.0"))
-    port_raw = _extract(["--port", "-p"], os.environ.get("PORT", "8000"))
-    try:
-        port = int(port_raw)
-    except ValueError:
-        port = 8000
-    reload_flag = "--no-reload" not in argv
-
+    host, port, reload_flag = _parse_run_args(sys.argv[1:])
     uvicorn.run("teaser_web.app:app", host=host, port=port, reload=reload_flag)
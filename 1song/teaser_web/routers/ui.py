@@ -1,35 +1,201 @@
 """UI routes for teaser generation."""
-from fastapi import APIRouter, Request, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Depends, Request, Form
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import asyncio
+import functools
+import os
+import re
+import time
+from pathlib import Path
+from types import SimpleNamespace
 from podcast_teaser_generator.workflow import TeaserGenerationWorkflow
 from podcast_teaser_generator.models import PodcastScript
 from podcast_teaser_generator.config import settings
 
+try:
+    import orjson
+except ImportError:  # optional speedup (perf extra); stdlib json responses otherwise
+    orjson = None
+
+# /api/status is polled continuously while a teaser renders; serialize with orjson when available
+_JSONResponseClass = ORJSONResponse if orjson is not None else JSONResponse
+
 templates = Jinja2Templates(directory="teaser_web/templates")
 router = APIRouter()
 
+
+@functools.lru_cache(maxsize=1)
+def _get_workflow() -> TeaserGenerationWorkflow:
+    """Workflow shared by all requests, so agent clients and the workflow's caches are reused.
+
+    Created on first use; everything runs on the one event loop, so no locking is needed.
+    """
+    return TeaserGenerationWorkflow()
+
+
+async def shutdown() -> None:
+    """Close the shared workflow's network clients; called from the app's lifespan."""
+    if _get_workflow.cache_info().currsize:
+        await _get_workflow().aclose()
+
+
+@functools.lru_cache(maxsize=1)
+def _index_template():
+    """Compiled index.html, loaded once so requests skip the loader's lookup and stat."""
+    return templates.get_template("index.html")
+
+# Output layout, bound once at import (app.py mounts /output on the same directory at startup)
+# so the status path doesn't go through settings attribute access on every request.
+_OUTPUT_DIR = Path(settings.output_dir)
+_AUDIO_NAME = f"audio.{settings.output_audio_format}"
+_VIDEO_NAME = f"video.{settings.output_video_format}"
+_FINAL_NAME = f"final.{settings.output_video_format}"
+
+
+@functools.lru_cache(maxsize=2048)
+def _project_paths(project_id: str) -> tuple[str, str, str, str]:
+    """(project dir, audio, video, final) paths as strings; built once per project, not per poll."""
+    project_dir = _OUTPUT_DIR / project_id
+    return (
+        str(project_dir),
+        str(project_dir / _AUDIO_NAME),
+        str(project_dir / _VIDEO_NAME),
+        str(project_dir / _FINAL_NAME),
+    )
+
 # In-memory task registry (ephemeral; acceptable for single-instance dev use)
 background_tasks: dict[str, asyncio.Task] = {}
 
+# project_id -> (monotonic time, /api/status payload). Polls within the TTL reuse the payload;
+# completed payloads live longer, but only while their final teaser is still on disk (files can
+# be deleted or regenerated outside this process).
+_STATUS_TTL = 0.5
+_COMPLETED_STATUS_TTL = 10.0
+_STATUS_CACHE_MAX = 1024
+_status_cache: dict[str, tuple[float, dict]] = {}
+
+# project_id -> Event set (and replaced) whenever its background task produces an artifact or
+# finishes; /api/status?wait=N parks on it instead of the client re-polling.
+project_events: dict[str, asyncio.Event] = {}
+_MAX_STATUS_WAIT = 30.0
+
+
+_MAX_TRACKED_TASKS = 512
+
+
+async def _run_together(*coros) -> list:
+    """Run ``coros`` concurrently; the first failure cancels the others and is re-raised as-is.
+    
+    Same approach as workflow._run_media: a TaskGroup where available, otherwise gather with
+    explicit cancellation, so a failed step never leaves a sibling (e.g. a Sora job) running.
+    """
+    if not hasattr(asyncio, "TaskGroup"):
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(coro) for coro in coros]
+    except BaseExceptionGroup as eg:
+        raise eg.exceptions[0]
+    return [task.result() for task in tasks]
+
+
+def _register_task(project_id: str, coro_factory) -> asyncio.Task:
+    """Start ``coro_factory()`` as the project's background task unless one is already running.
+
+    Check and insert happen without an await in between, so concurrent requests for the same
+    project cannot both start a task. Finished tasks are dropped once the registry exceeds
+    ``_MAX_TRACKED_TASKS``, and each task drops itself when its final teaser exists.
+    """
+    task = background_tasks.get(project_id)
+    if task is not None and not task.done():
+        return task
+    project_events[project_id] = asyncio.Event()
+    _status_cache.pop(project_id, None)  # a cached "completed" must not outlive a regeneration
+    task = asyncio.create_task(coro_factory())
+    background_tasks[project_id] = task
+    task.add_done_callback(functools.partial(_forget_task, project_id))
+    excess = len(background_tasks) - _MAX_TRACKED_TASKS
+    if excess > 0:
+        for key in [k for k, t in background_tasks.items() if t.done()][:excess]:
+            background_tasks.pop(key, None)
+    return task
+
+
+def _forget_task(project_id: str, task: asyncio.Task) -> None:
+    """Done-callback: once the final teaser exists, status comes from disk and the task can go."""
+    if background_tasks.get(project_id) is task and os.path.exists(_project_paths(project_id)[3]):
+        background_tasks.pop(project_id, None)
+
+
+def _discard_artifacts(project_id: str) -> None:
+    """Delete a project's audio/video/final so status can't report them while they're regenerated."""
+    for path in _project_paths(project_id)[1:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _notify_project(project_id: str, finished: bool = False) -> None:
+    """Drop the cached status for ``project_id`` and wake long-polling /api/status requests."""
+    _status_cache.pop(project_id, None)
+    event = project_events.pop(project_id, None) if finished else project_events.get(project_id)
+    if event is not None:
+        if not finished:
+            project_events[project_id] = asyncio.Event()
+        event.set()
+
+# Project ids are workflow._stable_id values: 12 lowercase hex chars
+_PROJECT_ID_RE = re.compile(r"\A[0-9a-f]{12}\Z")
+
+_OUTPUT_ROOT_SEP = os.path.join(os.path.abspath(_OUTPUT_DIR), "")
+
+
+@functools.lru_cache(maxsize=4096)
 def _fs_to_web_path(path: str | None) -> str | None:
     """Convert absolute filesystem path under output_dir into web path served at /output.
-    Returns None if path is None or outside output_dir.
+    Returns None if path is None or outside output_dir. Pure, so results are memoized:
+    status polls convert the same few artifact paths over and over.
     """
     if not path:
         return None
-    try:
-        import os
-        root = os.path.abspath(settings.output_dir)
-        ap = os.path.abspath(path)
-        if not ap.startswith(root):
-            return None
-        rel = os.path.relpath(ap, root)
-        return f"/output/{rel}".replace('//', '/')
-    except Exception:
+    # Artifact paths from the workflow are already absolute and under output_dir; only paths
+    # that might need normalizing (e.g. containing "..") take the slow path below.
+    if path.startswith(_OUTPUT_ROOT_SEP) and ".." not in path:
+        return "/output/" + path[len(_OUTPUT_ROOT_SEP):].replace(os.sep, "/")
+    # normpath is pure string work; only relative paths need the cwd lookup of abspath
+    ap = os.path.normpath(path) if os.path.isabs(path) else os.path.abspath(path)
+    if not ap.startswith(_OUTPUT_ROOT_SEP):
         return None
+    return "/output/" + ap[len(_OUTPUT_ROOT_SEP):].replace(os.sep, "/")
+
+# Voices offered by the UI -> (language, gender); other voices fall back to parsing the name
+_VOICE_META: dict[str, tuple[str, str]] = {
+    "en-US-JennyNeural": ("en-US", "female"),
+    "en-US-SaraNeural": ("en-US", "female"),
+    "en-US-GuyNeural": ("en-US", "male"),
+    "he-IL-HilaNeural": ("he-IL", "female"),
+    "he-IL-AvriNeural": ("he-IL", "male"),
+}
+
+def _lang_from_voice(voice: str) -> str | None:
+    """Locale prefix of an Azure voice name ("he-IL-HilaNeural" -> "he-IL"); None without one."""
+    first = voice.find("-")
+    if first < 0:
+        return None
+    second = voice.find("-", first + 1)
+    return voice if second < 0 else voice[:second]
+
 
 class GenerationRequest(BaseModel):
     title: str
@@ -44,133 +210,147 @@ class GenerationRequest(BaseModel):
     mode: str = "audio"  # audio or full
     force: bool = False  # force regenerate all artifacts
 
+# Form defaults for the index page; built once at import (settings are fixed per process)
+_INDEX_DEFAULTS: dict = {
+    "title": "Demo Episode",
+    "prompt": (
+        "<TeaserTemplate>\n"
+        "  <Episode>\n"
+        "    <SongTitle>{SONG_TITLE}</SongTitle>\n"
+        "    <Artist>{ARTIST}</Artist>\n"
+        "  </Episode>\n\n"
+        "  <Content>\n"
+        "    <SurprisingInsight>\n"
+        "      {SURPRISING_LYRIC_INSIGHT}\n"
+        "    </SurprisingInsight>\n\n"
+        "    <EmotionalAngle>\n"
+        "      {EMOTIONAL_ANGLE}\n"
+        "    </EmotionalAngle>\n\n"
+        "    <CuriosityHook>\n"
+        "      {HOOK_QUESTION}\n"
+        "    </CuriosityHook>\n"
+        "  </Content>\n\n"
+        "  <Tone>\n"
+        "    curious, energetic, inviting\n"
+        "  </Tone>\n\n"
+        "  <Audience>\n"
+        "    music fans 18–35 who love storytelling in music\n"
+        "  </Audience>\n\n"
+        "  <Output>\n"
+        "    15s punchy spoken teaser\n"
+        "  </Output>\n"
+        "</TeaserTemplate>"
+    ),
+    "headline": "Catchy Headline Here",
+    "duration": 15,
+    "voice_name": settings.azure_speech_voice or "en-US-JennyNeural",
+    # Structured template defaults
+    "song_title": "<Enter Song Title>",
+    "artist": "<Enter Artist>",
+    "surprising_insight": "Insert a little-known or misunderstood lyric element that reveals hidden meaning.",
+    "emotional_angle": "Describe the deeper emotional context or personal journey the song reflects.",
+    "curiosity_hook": "Pose a question that makes the listener want to hear the full story.",
+    "tone_field": "curious, energetic, inviting",
+    "audience_field": "music fans 18–35 who love storytelling in music",
+    "output_desc": "${DURATION}s punchy spoken teaser",
+}
+# Jinja resolves `defaults.x` with getattr before falling back to item lookup, so an attribute
+# namespace avoids a failed getattr per field on every render.
+_INDEX_DEFAULTS_NS = SimpleNamespace(**_INDEX_DEFAULTS)
+
 @router.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "defaults": {
-                "title": "Demo Episode",
-                "prompt": (
-                    "<TeaserTemplate>\n"
-                    "  <Episode>\n"
-                    "    <SongTitle>{SONG_TITLE}</SongTitle>\n"
-                    "    <Artist>{ARTIST}</Artist>\n"
-                    "  </Episode>\n\n"
-                    "  <Content>\n"
-                    "    <SurprisingInsight>\n"
-                    "      {SURPRISING_LYRIC_INSIGHT}\n"
-                    "    </SurprisingInsight>\n\n"
-                    "    <EmotionalAngle>\n"
-                    "      {EMOTIONAL_ANGLE}\n"
-                    "    </EmotionalAngle>\n\n"
-                    "    <CuriosityHook>\n"
-                    "      {HOOK_QUESTION}\n"
-                    "    </CuriosityHook>\n"
-                    "  </Content>\n\n"
-                    "  <Tone>\n"
-                    "    curious, energetic, inviting\n"
-                    "  </Tone>\n\n"
-                    "  <Audience>\n"
-                    "    music fans 18–35 who love storytelling in music\n"
-                    "  </Audience>\n\n"
-                    "  <Output>\n"
-                    "    15s punchy spoken teaser\n"
-                    "  </Output>\n"
-                    "</TeaserTemplate>"
-                ),
-                "headline": "Catchy Headline Here",
-                "duration": 15,
-                "voice_name": settings.azure_speech_voice or "en-US-JennyNeural",
-                # Structured template defaults
-                "song_title": "<Enter Song Title>",
-                "artist": "<Enter Artist>",
-                "surprising_insight": "Insert a little-known or misunderstood lyric element that reveals hidden meaning.",
-                "emotional_angle": "Describe the deeper emotional context or personal journey the song reflects.",
-                "curiosity_hook": "Pose a question that makes the listener want to hear the full story.",
-                "tone_field": "curious, energetic, inviting",
-                "audience_field": "music fans 18–35 who love storytelling in music",
-                "output_desc": "${DURATION}s punchy spoken teaser",
-            },
-        },
-    )
+    return HTMLResponse(_index_template().render(request=request, defaults=_INDEX_DEFAULTS_NS))
+
+async def _parse_generation_request(request: Request) -> GenerationRequest:
+    """Validate the raw JSON body in one pydantic-core pass (no intermediate json.loads dict)."""
+    try:
+        return GenerationRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
 
-@router.post("/api/generate", response_class=JSONResponse)
-async def api_generate(data: GenerationRequest):
-    """Kick off generation. For mode=full, video + compose happen in background so the
-    HTTP response returns promptly (prevents long-poll hang). Frontend should poll /api/status."""
-    workflow = TeaserGenerationWorkflow()
+
+@router.post(
+    "/api/generate",
+    response_class=_JSONResponseClass,
+    # Body is parsed by the dependency above; keep the documented request schema
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": GenerationRequest.model_json_schema()}},
+    }},
+)
+async def api_generate(data: GenerationRequest = Depends(_parse_generation_request)):
+    """Kick off generation and return right away with the project id.
+
+    Teaser content, TTS and (for mode=full) video + compose all run in one background task;
+    the frontend picks up artifacts from /api/status as they land.
+    """
+    workflow = _get_workflow()
 
     # Derive language & gender from voice_name (single dropdown parameter)
     voice = data.voice_name or settings.azure_speech_voice or "en-US-JennyNeural"
-    # Language is first two hyphen-separated parts (e.g. en-US, he-IL)
-    parts = voice.split("-")
-    language = "-".join(parts[0:2]) if len(parts) >= 2 else (data.language or settings.azure_speech_language or "en-US")
-    gender_map = {
-        "en-US-JennyNeural": "female",
-        "en-US-SaraNeural": "female",
-        "en-US-GuyNeural": "male",
-        "he-IL-HilaNeural": "female",
-        "he-IL-AvriNeural": "male",
-    }
-    inferred_gender = gender_map.get(voice)
+    meta = _VOICE_META.get(voice)
+    if meta is not None:
+        language, inferred_gender = meta
+    else:
+        language = _lang_from_voice(voice) or data.language or settings.azure_speech_language or "en-US"
+        inferred_gender = None
 
-    # Build script model for stable ID and subsequent steps
+    # Build script model for the media steps; its id matches step_generate_from_input's
     content_text = data.script or data.prompt or ""
     script_model = PodcastScript(title=data.title, content=content_text)
+    pid = workflow.compute_stable_id(data.title, prompt=data.prompt, full_script=data.script)
 
-    # Step 1: teaser content + audio (stores voice metadata)
-    # Ensure global settings reflects language so prompt generation outputs correct language
-    try:
-        from podcast_teaser_generator.config import settings as global_settings
-        global_settings.azure_speech_language = language
-    except Exception:
-        pass
-    pid, _ = await workflow.step_generate_from_input(
-        title=data.title,
-        prompt=data.prompt,
-        full_script=data.script,
-        headline=data.headline,
-        target_duration=data.duration,
-        language=language,
-        voice_gender=inferred_gender,
-        voice_name=voice,
-        force=data.force,
-    )
-    _, audio_path = await workflow.step_tts(script_model, language=language, force=data.force)
-    audio_url = _fs_to_web_path(audio_path)
+    async def run_pipeline():
+        async def _step(coro):
+            result = await coro
+            _notify_project(pid)
+            return result
 
-    # If only audio requested, return immediately.
-    if data.mode == "audio":
-        return {
-            "project_id": pid,
-            "audio_path": audio_path,  # legacy absolute
-            "audio_url": audio_url,
-            "video_path": None,
-            "video_url": None,
-            "final_path": None,
-            "final_url": None,
-            "status": "audio_ready",
-        }
-
-    # For full mode, schedule video + compose in background if not already done
-    async def run_video_and_compose():
         try:
-            await workflow.step_video(script_model, force=data.force)
+            # Teaser content first (stores voice metadata for the audio step); language is
+            # passed explicitly so concurrent requests never share it through settings.
+            await workflow.step_generate_from_input(
+                title=data.title,
+                prompt=data.prompt,
+                full_script=data.script,
+                headline=data.headline,
+                target_duration=data.duration,
+                language=language,
+                voice_gender=inferred_gender,
+                voice_name=voice,
+                force=data.force,
+            )
+            if data.mode == "audio":
+                await _step(workflow.step_tts(script_model, language=language, force=data.force))
+                return
+            # TTS and video only need the teaser content, so they run together before compose;
+            # the compositor warms up alongside them. A failure cancels the sibling steps, so
+            # nothing keeps writing this project's files once the task reports done.
+            await _run_together(
+                _step(workflow.step_tts(script_model, language=language, force=data.force)),
+                _step(workflow.step_video(script_model, force=data.force)),
+                workflow.step_compose_prep(script_model, force=data.force),
+            )
             await workflow.step_compose(script_model, language=language, force=data.force)
         except Exception as e:
             # Log; status endpoint will reflect presence/absence of files
             from loguru import logger as _log
-            _log.error(f"Background video/compose failed for {pid}: {e}")
+            _log.error(f"Background generation ({data.mode}) failed for {pid}: {e}")
+        finally:
+            _notify_project(pid, finished=True)
 
-    if pid not in background_tasks or background_tasks[pid].done():
-        background_tasks[pid] = asyncio.create_task(run_video_and_compose())
+    running = background_tasks.get(pid)
+    if data.force and (running is None or running.done()):
+        # The response returns before anything is regenerated; without this the first status
+        # poll would show the previous run's files as ready.
+        _discard_artifacts(pid)
+    _register_task(pid, run_pipeline)
 
     return {
         "project_id": pid,
-        "audio_path": audio_path,
-        "audio_url": audio_url,
+        "audio_path": None,
+        "audio_url": None,
         "video_path": None,
         "video_url": None,
         "final_path": None,
@@ -179,23 +359,65 @@ async def api_generate(data: GenerationRequest):
     }
 
 
-@router.get("/api/status", response_class=JSONResponse)
-async def api_status(project_id: str):
-    """Return generation status and available asset paths for a given project id."""
-    # Reconstruct paths based on hashing logic (same as workflow._stable_id_and_dir)
-    # The provided project_id is already the stable id, so we directly inspect output dir.
-    from pathlib import Path
-    project_dir = Path(settings.output_dir) / project_id
-    audio_target = project_dir / f"audio.{settings.output_audio_format}"
-    video_target = project_dir / f"video.{settings.output_video_format}"
-    final_target = project_dir / f"final.{settings.output_video_format}"
+@router.get("/api/status", response_class=_JSONResponseClass)
+async def api_status(project_id: str, wait: float = 0):
+    """Return generation status and available asset paths for a given project id.
+
+    With ``wait`` > 0 (seconds, capped at 30) and a background task still running, the request
+    is held until that task makes progress or the wait expires, then returns fresh status.
+    """
+    # Reject malformed ids (including path escapes) before touching the filesystem
+    if not _PROJECT_ID_RE.match(project_id):
+        return _JSONResponseClass({"project_id": project_id, "status": "invalid"}, status_code=400)
+    # Taken before the snapshot so a notification in between is not missed
+    event = project_events.get(project_id) if wait > 0 else None
+    result = _status_snapshot(project_id)
+    if event is None or result["status"] == "completed" or result["task_state"] != "running":
+        return result
+    try:
+        await asyncio.wait_for(event.wait(), timeout=min(wait, _MAX_STATUS_WAIT))
+    except asyncio.TimeoutError:
+        return result
+    return _status_snapshot(project_id)
+
+
+def _status_snapshot(project_id: str) -> dict:
+    """Status payload for ``project_id`` from the files on disk (cached briefly, see _STATUS_TTL)."""
+    now = time.monotonic()
+    cached = _status_cache.get(project_id)
+    if cached is not None:
+        age = now - cached[0]
+        if age < _STATUS_TTL:
+            return cached[1]
+        if (
+            cached[1]["status"] == "completed"
+            and age < _COMPLETED_STATUS_TTL
+            and os.path.exists(cached[1]["final_path"])
+        ):
+            return cached[1]
 
-    def present(p: Path, min_size: int = 1):
-        return p.exists() and p.stat().st_size >= min_size
+    # Same layout as workflow._project_paths; project_id is already the stable id, so we
+    # directly inspect the output dir.
+    project_dir, audio_target, video_target, final_target = _project_paths(project_id)
 
-    audio_path = str(audio_target) if present(audio_target, 1) else None
-    video_path = str(video_target) if present(video_target, 1024) else None
-    final_path = str(final_target) if present(final_target, 1024) else None
+    # One readdir instead of an exists()+stat() pair per artifact; only the entries we
+    # report on are stat'ed.
+    wanted = {_AUDIO_NAME, _VIDEO_NAME, _FINAL_NAME}
+    sizes: dict = {}
+    try:
+        with os.scandir(project_dir) as it:
+            for entry in it:
+                if entry.name in wanted:
+                    try:
+                        sizes[entry.name] = entry.stat().st_size
+                    except FileNotFoundError:
+                        pass
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+
+    audio_path = audio_target if sizes.get(_AUDIO_NAME, -1) >= 1 else None
+    video_path = video_target if sizes.get(_VIDEO_NAME, -1) >= 1024 else None
+    final_path = final_target if sizes.get(_FINAL_NAME, -1) >= 1024 else None
     audio_url = _fs_to_web_path(audio_path)
     video_url = _fs_to_web_path(video_path)
     final_url = _fs_to_web_path(final_path)
@@ -219,7 +441,7 @@ async def api_status(project_id: str):
     else:
         status = "pending"
 
-    return {
+    result = {
         "project_id": project_id,
         "status": status,
         "task_state": task_state,
@@ -230,3 +452,7 @@ async def api_status(project_id: str):
         "video_url": video_url,
         "final_url": final_url,
     }
+    if project_id not in _status_cache and len(_status_cache) >= _STATUS_CACHE_MAX:
+        _status_cache.pop(next(iter(_status_cache)))  # drop the oldest entry
+    _status_cache[project_id] = (now, result)
+    return result